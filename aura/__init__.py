@@ -13,9 +13,11 @@
 # limitations under the License.
 
 from datetime import UTC, datetime, timedelta
+from functools import cache
 
 from apscheduler.triggers.interval import IntervalTrigger
-from fastapi import FastAPI
+from fastapi import APIRouter, FastAPI
+from fastapi.middleware.gzip import GZipMiddleware
 from fastapi.staticfiles import StaticFiles
 from fastui import prebuilt_html
 from starlette.responses import HTMLResponse, PlainTextResponse
@@ -53,17 +55,24 @@ scheduler.add_job(
 #
 app = FastAPI()
 
+# the FastUI JSON component trees are very repetitive and compress well,
+# the log event stream (text/event-stream) is excluded from compression by default
+app.add_middleware(GZipMiddleware, minimum_size=1000)
+
 # make sure the folder named 'static' exists in the project,
 # and put the css and js files inside a subfolder called 'assets'
 app.mount("/static", StaticFiles(directory=settings.STATIC_DIRECTORY), name="static")
 
-# include routes
+# include routes, all FastUI and NSI endpoints are grouped under a single /api router,
+# the catch-all landing page route below must be declared after all other routes
+api_router = APIRouter(prefix="/api")
+api_router.include_router(reservations_router, prefix="/reservations")
+api_router.include_router(stp_router, prefix="/stp")
+api_router.include_router(sdp_router, prefix="/sdp")
+api_router.include_router(nsi_router, prefix="/nsi")
+api_router.include_router(home_router)
 app.include_router(healthcheck_router)
-app.include_router(reservations_router, prefix="/api/reservations")
-app.include_router(stp_router, prefix="/api/stp")
-app.include_router(sdp_router, prefix="/api/sdp")
-app.include_router(nsi_router, prefix="/api/nsi")
-app.include_router(home_router, prefix="/api")
+app.include_router(api_router)
 
 
 @app.get("/robots.txt", response_class=PlainTextResponse)
@@ -76,10 +85,16 @@ async def favicon_ico() -> str:
     return "page not found"
 
 
+@cache
+def landing_html(title: str, root_path: str) -> str:
+    """Render the FastUI single page application HTML once per title and root path."""
+    kwargs: dict = {"title": title}
+    if root_path:
+        kwargs["api_root_url"] = f"{root_path}/api"
+        kwargs["api_path_strip"] = root_path
+    return prebuilt_html(**kwargs)
+
+
 @app.get("/{path:path}")
 async def html_landing() -> HTMLResponse:
-    kwargs: dict = {"title": settings.SITE_TITLE}
-    if settings.ROOT_PATH:
-        kwargs["api_root_url"] = f"{settings.ROOT_PATH}/api"
-        kwargs["api_path_strip"] = settings.ROOT_PATH
-    return HTMLResponse(prebuilt_html(**kwargs))
+    return HTMLResponse(landing_html(settings.SITE_TITLE, settings.ROOT_PATH))
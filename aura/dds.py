@@ -14,10 +14,12 @@
 
 import base64
 import zlib
+from collections import defaultdict
 
 import structlog
 from pydantic import HttpUrl
-from sqlalchemy import or_, update
+from sqlalchemy.exc import MultipleResultsFound
+from structlog.stdlib import BoundLogger
 
 from aura.db import Session
 from aura.model import SDP, STP
@@ -35,7 +37,7 @@ IS_ALIAS = "http://schemas.ogf.org/nml/2013/05/base#isAlias"
 
 
 def strip_urn(urn: str) -> str:
-    return urn.replace("urn:ogf:network:", "")
+    return urn.removeprefix("urn:ogf:network:")
 
 
 def to_dict(index: str, collection: list | dict) -> dict:
@@ -64,10 +66,10 @@ def topology_to_stps(topology: dict) -> list[STP]:
         return []
 
     stps = []
-    for bidirectionalPortId in bidirectionalPorts:
+    for bidirectionalPortId, bidirectionalPort in bidirectionalPorts.items():
         inboundPort: dict | None = None
         outboundPort: dict | None = None
-        for unidirectionalPortId in to_list("id", bidirectionalPorts[bidirectionalPortId]["PortGroup"]):
+        for unidirectionalPortId in to_list("id", bidirectionalPort["PortGroup"]):
             if unidirectionalPortId in inboundPorts:
                 inboundPort = inboundPorts[unidirectionalPortId]
             elif unidirectionalPortId in outboundPorts:
@@ -96,37 +98,43 @@ def topology_to_stps(topology: dict) -> list[STP]:
                 inboundAlias=inboundAliasId,
                 outboundAlias=outboundAliasId,
                 vlanRange=inboundPort["LabelGroup"] if inboundPort else "",
-                description=(
-                    bidirectionalPorts[bidirectionalPortId]["name"]
-                    if bidirectionalPorts[bidirectionalPortId]["name"]
-                    else ""
-                ),
+                description=bidirectionalPort["name"] if bidirectionalPort["name"] else "",
                 active=True,
             )
         )
-        log.debug(f"found STP {bidirectionalPortId}: {stps[-1]}")
+        log.debug("found STP", bidirectionalPortId=bidirectionalPortId, stp=stps[-1])
     return stps
 
 
+def stp_log(stp: STP) -> BoundLogger:
+    """Return logger bound to all topology related fields of the given STP."""
+    log: BoundLogger = logger.bind(
+        stpId=stp.stpId,
+        inboundPort=stp.inboundPort,
+        outboundPort=stp.outboundPort,
+        inboundAlias=stp.inboundAlias,
+        outboundAlias=stp.outboundAlias,
+        vlanRange=stp.vlanRange,
+        description=stp.description,
+        active=stp.active,
+    )
+    return log
+
+
 def update_stps(stps: list[STP]) -> None:
     """Update STP table with topology information from DDS."""
-    new_stp_ids = [stp.stpId for stp in stps]
-    for new_stp in stps:
-        log = logger.bind(
-            stpId=new_stp.stpId,
-            inboundPort=new_stp.inboundPort,
-            outboundPort=new_stp.outboundPort,
-            inboundAlias=new_stp.inboundAlias,
-            outboundAlias=new_stp.outboundAlias,
-            vlanRange=new_stp.vlanRange,
-            description=new_stp.description,
-            active=new_stp.active,
-        )
-        with Session.begin() as session:
-            existing_stp = session.query(STP).filter(STP.stpId == new_stp.stpId).one_or_none()  # type: ignore[arg-type]
+    new_stp_ids = {stp.stpId for stp in stps}
+    with Session.begin() as session:
+        # fetch all known STPs once and index them on stpId instead of querying the database for every STP,
+        # changes to the attached instances are flushed together when the transaction is committed
+        existing_stps = {stp.stpId: stp for stp in session.query(STP).all()}
+        for new_stp in stps:
+            existing_stp = existing_stps.get(new_stp.stpId)
             if existing_stp is None:
-                log.info("add new STP")
+                stp_log(new_stp).info("add new STP")
                 session.add(new_stp)
+                # a topology can list the same STP more than once, update instead of adding it twice
+                existing_stps[new_stp.stpId] = new_stp
             elif (
                 existing_stp.inboundPort != new_stp.inboundPort
                 or existing_stp.outboundPort != new_stp.outboundPort
@@ -136,7 +144,7 @@ def update_stps(stps: list[STP]) -> None:
                 or existing_stp.description != new_stp.description  # comment out to enable modify description
                 or existing_stp.active != new_stp.active
             ):
-                log.info("update existing STP")
+                stp_log(new_stp).info("update existing STP")
                 existing_stp.inboundPort = new_stp.inboundPort
                 existing_stp.outboundPort = new_stp.outboundPort
                 existing_stp.inboundAlias = new_stp.inboundAlias
@@ -145,13 +153,11 @@ def update_stps(stps: list[STP]) -> None:
                 existing_stp.description = new_stp.description  # comment out to enable modify description
                 existing_stp.active = new_stp.active
             else:
-                log.debug("STP did not change")
-    with Session.begin() as session:
-        existing_stp_ids = [row[0] for row in session.query(STP.stpId).filter(STP.active).all()]
-        for vanished_stp_id in [stpId for stpId in existing_stp_ids if stpId not in new_stp_ids]:
-            logger.info("mark STP as inactive", stpId=vanished_stp_id)
-            session.execute(update(STP).where(STP.stpId == vanished_stp_id).values(active=False))
-        session.commit()
+                # most common case, do not bind all STP fields just to log at debug level
+                logger.debug("STP did not change", stpId=new_stp.stpId)
+        for vanished_stp in [stp for stpId, stp in existing_stps.items() if stp.active and stpId not in new_stp_ids]:
+            logger.info("mark STP as inactive", stpId=vanished_stp.stpId)
+            vanished_stp.active = False
 
 
 def has_alias(stp: STP) -> bool:
@@ -171,15 +177,24 @@ def update_sdps() -> None:
             and z.outboundAlias == a.inboundPort
         )
 
+    def sdp_key(stpAId: int, stpZId: int) -> tuple[int, int]:
+        """Identify SDP by its pair of STP, regardless of the order of the STP."""
+        return (stpAId, stpZId) if stpAId <= stpZId else (stpZId, stpAId)
+
     with Session() as session:
         stps = session.query(STP).filter(STP.active == True).all()
+    # index STPs on their ports so that the candidate STPs to connect to are looked up instead of searched for
+    stps_by_ports: defaultdict[tuple[str | None, str | None], list[STP]] = defaultdict(list)
+    for stp in stps:
+        if has_alias(stp):
+            stps_by_ports[(stp.inboundPort, stp.outboundPort)].append(stp)
     # find connected STPs
     sdps = []
     paired: set[int] = set()
     for a in stps:
-        if a.id in paired:
+        if a.id in paired or not has_alias(a):
             continue
-        for z in stps:
+        for z in stps_by_ports.get((a.outboundAlias, a.inboundAlias), ()):
             if z.id in paired or z.id == a.id:
                 continue
             if is_sdp(a, z):
@@ -187,27 +202,28 @@ def update_sdps() -> None:
                 paired.add(a.id)
                 paired.add(z.id)
                 break
-    # process found SDPs
-    for stp_a, stp_z in sdps:
-        description = f"{stp_a.description} <-> {stp_z.description}"
-        log = logger.bind(
-            stpAId=stp_a.stpId,
-            stpZId=stp_z.stpId,
-            vlanRange=stp_a.vlanRange,  # TODO: should store a and z overlapping range only
-            description=description,
-            active=True,
-        )
-        with Session.begin() as session:
-            existing_sdp = (
-                session.query(SDP)
-                .filter(
-                    or_(
-                        (SDP.stpAId == stp_a.id) & (SDP.stpZId == stp_z.id),
-                        (SDP.stpAId == stp_z.id) & (SDP.stpZId == stp_a.id),
-                    )
-                )
-                .one_or_none()
-            )  # type: ignore[arg-type]
+    with Session.begin() as session:
+        # fetch all known SDPs once and index them on their pair of STP, regardless of the order of the STP,
+        # changes to the attached instances are flushed together when the transaction is committed,
+        # duplicate SDP are only an error when the pair is looked up, as with the former per SDP query
+        existing_sdps: defaultdict[tuple[int, int], list[SDP]] = defaultdict(list)
+        all_sdps = session.query(SDP).all()
+        for sdp in all_sdps:
+            existing_sdps[sdp_key(sdp.stpAId, sdp.stpZId)].append(sdp)
+        # process found SDPs
+        for stp_a, stp_z in sdps:
+            description = f"{stp_a.description} <-> {stp_z.description}"
+            log = logger.bind(
+                stpAId=stp_a.stpId,
+                stpZId=stp_z.stpId,
+                vlanRange=stp_a.vlanRange,  # TODO: should store a and z overlapping range only
+                description=description,
+                active=True,
+            )
+            key = sdp_key(stp_a.id, stp_z.id)  # type: ignore[arg-type]
+            if len(found_sdps := existing_sdps.get(key, [])) > 1:
+                raise MultipleResultsFound(f"multiple SDP found between STP {key[0]} and {key[1]}")
+            existing_sdp = found_sdps[0] if found_sdps else None
             if existing_sdp is None:
                 log.info("add new SDP")
                 session.add(
@@ -229,15 +245,15 @@ def update_sdps() -> None:
                 existing_sdp.active = True
             else:
                 log.debug("SDP did not change")
-    with Session.begin() as session:
-        existing_sdps = [sorted([sdp.stpAId, sdp.stpZId]) for sdp in session.query(SDP).filter(SDP.active).all()]
-        new_sdps = [sorted([sdp[0].id, sdp[1].id]) for sdp in sdps]
-        for vanished_sdp in [sdp for sdp in existing_sdps if sorted(sdp) not in new_sdps]:
-            stpA = session.query(STP).filter(STP.id == vanished_sdp[0]).one()
-            stpZ = session.query(STP).filter(STP.id == vanished_sdp[1]).one()
-            logger.info("mark SDP as inactive", stpA=stpA.stpId, stpZ=stpZ.stpId, vlanRange=stpA.vlanRange)
-            session.execute(update(SDP).where((SDP.stpAId == stpA.id) & (SDP.stpZId == stpZ.id)).values(active=False))
-        session.commit()
+        new_sdps = {sdp_key(stp_a.id, stp_z.id) for stp_a, stp_z in sdps}  # type: ignore[arg-type]
+        for vanished_sdp in [sdp for sdp in all_sdps if sdp.active and sdp_key(sdp.stpAId, sdp.stpZId) not in new_sdps]:
+            logger.info(
+                "mark SDP as inactive",
+                stpA=vanished_sdp.stpA.stpId,
+                stpZ=vanished_sdp.stpZ.stpId,
+                vlanRange=vanished_sdp.vlanRange,
+            )
+            vanished_sdp.active = False
 
 
 def unzip(document: dict) -> bytes:
@@ -12,8 +12,10 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from fastapi import APIRouter
-from fastui import AnyComponent, FastUI
+from functools import cache
+
+from fastapi import APIRouter, Response
+from fastui import FastUI
 from fastui import components as c
 from fastui.events import GoToEvent
 
@@ -37,16 +39,22 @@ how_to = """
 """
 
 @router.get("/", response_model=FastUI, response_model_exclude_none=True)
-def home() -> list[AnyComponent]:
+def home() -> Response:
     # Arno: Topologies are now pulled via __init__.py on a 1 minute interval.
-    return app_page(
+    return Response(content=_home_page(settings.ROOT_PATH), media_type="application/json")
+
+
+@cache
+def _home_page(root_path: str) -> bytes:
+    """Serialize the static home page once per root path."""
+    page = app_page(
         c.Heading(text="Introduction", level=3),
         c.Markdown(text=introduction),
         c.Heading(text="Connection states and operations", level=3),
         c.Div(
             components=[
                 c.Image(
-                    src=f"{settings.ROOT_PATH}/static/AuRA Reservation States.svg",
+                    src=f"{root_path}/static/AuRA Reservation States.svg",
                     alt="AURA Connection State and Actions diagram",
                     loading="lazy",
                     referrer_policy="no-referrer",
@@ -59,3 +67,4 @@ def home() -> list[AnyComponent]:
         c.Heading(text="Other Operations?", level=3),
         c.Paragraph(text="See buttons at top of page."),
     )
+    return FastUI(root=page).model_dump_json(by_alias=True, exclude_none=True).encode()
@@ -13,42 +13,82 @@
 # limitations under the License.
 
 import structlog
-from fastapi import APIRouter, Request, Response
+from fastapi import APIRouter, HTTPException, Request, Response
+from starlette.concurrency import run_in_threadpool
 from statemachine.exceptions import TransitionNotAllowed
 
 from aura.fsm import ConnectionStateMachine
 from aura.job import nsi_send_reserve_commit_job, scheduler
 from aura.model import Reservation
-from aura.nsi import acknowledgement_template, generate_acknowledgement_xml, nsi_xml_to_dict
+from aura.nsi import (
+    acknowledgement_template,
+    content_type_is_valid_soap,
+    generate_acknowledgement_xml,
+    nsi_xml_to_dict,
+)
 from aura.settings import settings
 
 router = APIRouter()
 
 logger = structlog.get_logger(__name__)
 
+# NSI callbacks are small SOAP messages, do not buffer arbitrarily large request bodies in memory
+MAX_CALLBACK_SIZE = 4 * 1024 * 1024
 
-def soap_action(request: Request, action: str) -> bool:
-    """Check if the given action matches the soap action header on the request."""
-    return request.headers["soapaction"] == action
+
+# notifications from the NSI provider carry the connection id of the reservation in the message body,
+# map their SOAP action onto the body element that holds it, all other messages are matched on correlation id
+CONNECTION_ID_NOTIFICATIONS = {
+    '"http://schemas.ogf.org/nsi/2013/12/connection/service/errorEvent"': "errorEvent",
+    '"http://schemas.ogf.org/nsi/2013/12/connection/service/dataPlaneStateChange"': "dataPlaneStateChange",
+    '"http://schemas.ogf.org/nsi/2013/12/connection/service/reserveTimeout"': "reserveTimeout",
+}
+
+
+async def read_callback_body(request: Request) -> bytes:
+    """Read the request body, reject it as soon as it grows beyond MAX_CALLBACK_SIZE.
+
+    Requests that are not SOAP or have no body are rejected without parsing them.
+    """
+    if not content_type_is_valid_soap(content_type := request.headers.get("content-type", "")):
+        logger.warning("NSI callback is not SOAP", content_type=content_type)
+        raise HTTPException(status_code=415, detail="NSI callback must be SOAP")
+    chunks: list[bytes] = []
+    size = 0
+    async for chunk in request.stream():
+        size += len(chunk)
+        if size > MAX_CALLBACK_SIZE:
+            logger.warning("NSI callback too large", max_size=MAX_CALLBACK_SIZE)
+            raise HTTPException(status_code=413, detail="NSI callback too large")
+        chunks.append(chunk)
+    if not size:
+        logger.warning("NSI callback without body")
+        raise HTTPException(status_code=400, detail="NSI callback without body")
+    return b"".join(chunks)
 
 
 @router.post("/callback/")
 async def nsi_callback(request: Request) -> Response:
     """Receive and process NSI async callback."""
+    body = nsi_xml_to_dict(await read_callback_body(request))
+    # update the reservation before acknowledging so that callbacks for the same connection are processed in order,
+    # but run the blocking database work in the threadpool instead of blocking the event loop
+    await run_in_threadpool(nsi_process_callback, request.headers["soapaction"], body)
+    nsi_acknowledgement = generate_acknowledgement_xml(
+        acknowledgement_template, body["Header"]["nsiHeader"]["correlationId"], settings.NSI_PROVIDER_ID
+    )
+    return Response(content=nsi_acknowledgement, media_type="application/xml")
+
+
+def nsi_process_callback(action: str, body: dict) -> None:
+    """Update reservation state machine with NSI async callback with given SOAP action and start corresponding job."""
     from aura.db import Session
 
-    body = nsi_xml_to_dict(await request.body())
     with Session.begin() as session:
         try:
             # TODO: add PassedEndTime
-            if soap_action(request, '"http://schemas.ogf.org/nsi/2013/12/connection/service/errorEvent"'):
-                connectionId = body["Body"]["errorEvent"]["connectionId"]
-                reservation = session.query(Reservation).filter(Reservation.connectionId == connectionId).one()
-            elif soap_action(request, '"http://schemas.ogf.org/nsi/2013/12/connection/service/dataPlaneStateChange"'):
-                connectionId = body["Body"]["dataPlaneStateChange"]["connectionId"]
-                reservation = session.query(Reservation).filter(Reservation.connectionId == connectionId).one()
-            elif soap_action(request, '"http://schemas.ogf.org/nsi/2013/12/connection/service/reserveTimeout"'):
-                connectionId = body["Body"]["reserveTimeout"]["connectionId"]
+            if (notification := CONNECTION_ID_NOTIFICATIONS.get(action)) is not None:
+                connectionId = body["Body"][notification]["connectionId"]
                 reservation = session.query(Reservation).filter(Reservation.connectionId == connectionId).one()
             else:
                 correlationId = body["Header"]["nsiHeader"]["correlationId"]
@@ -60,7 +100,7 @@ async def nsi_callback(request: Request) -> Response:
             )
             # update connection state machine
             csm = ConnectionStateMachine(reservation)
-            match request.headers["soapaction"]:
+            match action:
                 case '"http://schemas.ogf.org/nsi/2013/12/connection/service/reserveFailed"':
                     se = body["Body"]["reserveFailed"]["serviceException"]
                     text = se["childException"]["text"] if "childException" in se else se["text"]
@@ -106,15 +146,10 @@ async def nsi_callback(request: Request) -> Response:
         except TransitionNotAllowed as e:
             log.warning(str(e))
     # start job that corresponds with above state transition # TODO decide if we want to auto commit/provision or not
-    match request.headers["soapaction"]:
+    match action:
         case '"http://schemas.ogf.org/nsi/2013/12/connection/service/reserveConfirmed"':
             scheduler.add_job(nsi_send_reserve_commit_job, args=[reservation_id])
         # case '"http://schemas.ogf.org/nsi/2013/12/connection/service/reserveCommitConfirmed"':
         #     scheduler.add_job(nsi_send_provision_job, args=[reservation_id])
         # case '"http://schemas.ogf.org/nsi/2013/12/connection/service/reserveAbortConfirmed"':
         #     scheduler.add_job(nsi_send_reserve_commit_job(), args=[reservation_id])
-
-    nsi_acknowledgement = generate_acknowledgement_xml(
-        acknowledgement_template, body["Header"]["nsiHeader"]["correlationId"], settings.NSI_PROVIDER_ID
-    )
-    return Response(content=nsi_acknowledgement, media_type="application/xml")
@@ -14,13 +14,14 @@
 
 import asyncio
 from collections import defaultdict
+from collections.abc import Callable
 from datetime import datetime
 from pprint import pformat
 from typing import Annotated, Any, AsyncIterable, Optional, Self
 from uuid import uuid4
 
 import structlog
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Request, Response
 from fastui import AnyComponent, FastUI
 from fastui import components as c
 from fastui.base import BaseModel
@@ -29,6 +30,7 @@ from fastui.events import GoToEvent, PageEvent
 from fastui.forms import SelectSearchResponse, fastui_form
 from pydantic import Field, model_validator
 from requests import RequestException
+from starlette.concurrency import run_in_threadpool
 from starlette.responses import StreamingResponse
 from statemachine.exceptions import TransitionNotAllowed
 
@@ -38,6 +40,7 @@ from aura.exception import AuraNsiError
 from aura.frontend.util import (
     app_page,
     button_row,
+    not_modified,
     reservation_buttons,
     reservation_header,
     reservation_table,
@@ -52,6 +55,7 @@ from aura.job import (
     nsi_send_terminate_job,
     scheduler,
 )
+from aura.log import log_message_notifier
 from aura.model import SDP, STP, Bandwidth, Log, Reservation, Vlan
 from aura.nsi import nsi_send_query_summary_sync
 from aura.settings import settings
@@ -229,12 +233,16 @@ async def reservations() -> list[AnyComponent]:
 
 
 @router.get("/{id}/", response_model=FastUI, response_model_exclude_none=True)
-def reservation_details(id: int) -> list[AnyComponent]:
+def reservation_details(id: int, request: Request, response: Response) -> list[AnyComponent] | Response:
     """Display reservation details and action buttons."""
     with Session() as session:
         reservation = session.query(Reservation).filter(Reservation.id == id).one_or_none()  # type: ignore[arg-type]
     if reservation is None:
         return app_page(title=f"No reservation with id {id}.")
+    if not_modified_response := not_modified(
+        request, response, reservation, reservation.sourceStp, reservation.destStp
+    ):
+        return not_modified_response
     return app_page(
         reservation_buttons(reservation),
         c.Heading(text="Reservation details", level=5),
@@ -248,22 +256,36 @@ def reservation_details(id: int) -> list[AnyComponent]:
 
 
 async def reservation_log_stream(id: int) -> AsyncIterable[str]:
-    lines = []
+    lines: list[AnyComponent] = []
     last_timestamp = datetime.fromtimestamp(0)
-    while True:
-        await asyncio.sleep(0.5)
-        with Session() as session:
-            messages = (
-                session.query(Log.message, Log.timestamp)  # type: ignore[call-overload]
-                .filter(Log.reservation_id == id)
-                .filter(Log.timestamp > last_timestamp)
-                .all()
+    new_log_message = None
+    try:
+        while True:
+            # wait for the log handler to store a new message instead of polling the database,
+            # start waiting before the query so that a message stored in the meantime is not missed
+            new_log_message = log_message_notifier.waiter(id)
+            with Session() as session:
+                messages = (
+                    session.query(Log.message, Log.timestamp)  # type: ignore[call-overload]
+                    .filter(Log.reservation_id == id)
+                    .filter(Log.timestamp > last_timestamp)
+                    .all()
+                )
+            lines.extend(
+                c.Div(components=[c.Text(text=f"{timestamp.isoformat()} - {message}")])
+                for message, timestamp in messages
             )
-        for message, timestamp in messages:
-            lines.append(c.Div(components=[c.Text(text=f"{timestamp.isoformat()} - {message}")]))
-            last_timestamp = timestamp
-        m = FastUI(root=lines)  # type: ignore[arg-type]
-        yield f"data: {m.model_dump_json(by_alias=True, exclude_none=True)}\n\n"
+            if messages:
+                _, last_timestamp = messages[-1]
+            m = FastUI(root=lines)
+            yield f"data: {m.model_dump_json(by_alias=True, exclude_none=True)}\n\n"
+            try:
+                await asyncio.wait_for(new_log_message, timeout=30)
+            except TimeoutError:
+                pass  # refresh anyway every now and then
+    finally:
+        if new_log_message is not None:
+            new_log_message.cancel()
 
 
 @router.get("/{id}/log/sse")
@@ -272,7 +294,7 @@ async def reservation_log_sse(id: int) -> StreamingResponse:
 
 
 @router.get("/{id}/log", response_model=FastUI, response_model_exclude_none=True)
-async def reservation_log(id: int) -> list[AnyComponent]:
+def reservation_log(id: int) -> list[AnyComponent]:
     """Show streaming log for reservation with given id."""
     with Session() as session:
         reservation = session.query(Reservation).filter(Reservation.id == id).one_or_none()  # type: ignore[arg-type]
@@ -331,7 +353,8 @@ async def reservation_verify(id: int) -> list[AnyComponent]:
         reservation = session.query(Reservation).filter(Reservation.id == id).one()  # type: ignore[arg-type]
     components: list[AnyComponent] = [reservation_header(reservation)]
     try:
-        reply_dict = nsi_send_query_summary_sync(reservation)
+        # run the blocking SOAP request in the threadpool instead of blocking the event loop
+        reply_dict = await run_in_threadpool(nsi_send_query_summary_sync, reservation)
         # TODO: verify that the body contains a querySummarySyncConfirmed reply
         if "reservation" in reply_dict["Body"]["querySummarySyncConfirmed"]:
             nsi_connection_states = reply_dict["Body"]["querySummarySyncConfirmed"]["reservation"]["connectionStates"]
@@ -364,7 +387,7 @@ async def reservation_verify(id: int) -> list[AnyComponent]:
 
 
 @router.get("/{id}/set_state/{new_state}", response_model=FastUI, response_model_exclude_none=True)
-async def reservation_set_state(id: int, new_state: str) -> list[AnyComponent]:
+def reservation_set_state(id: int, new_state: str) -> list[AnyComponent]:
     """Set reservation with given id to connection_state."""
     if new_state not in ConnectionStateMachine.states_map.keys():
         raise HTTPException(status_code=400, detail="unknown connection state")
@@ -382,54 +405,43 @@ async def reservation_set_state(id: int, new_state: str) -> list[AnyComponent]:
     return [c.FireEvent(event=GoToEvent(url=f"/reservations/{id}/verify"))]
 
 
-@router.post("/{id}/terminate", response_model=FastUI, response_model_exclude_none=True)
-async def reservation_terminate(id: int) -> list[AnyComponent]:
-    """Terminate reservation with given id."""
+def send_nsi_request(
+    id: int, transition: Callable[[ConnectionStateMachine], None], job: Callable[[int], None], modal: str
+) -> list[AnyComponent]:
+    """Make transition on connection state machine of reservation with given id and schedule job to send NSI request."""
     try:
         with Session.begin() as session:
             reservation = session.query(Reservation).filter(Reservation.id == id).one()  # type: ignore[arg-type]
-            csm = ConnectionStateMachine(reservation)
-            csm.nsi_send_terminate()
-        scheduler.add_job(nsi_send_terminate_job, args=[id])
+            transition(ConnectionStateMachine(reservation))
+        scheduler.add_job(job, args=[id])
         return [
-            c.FireEvent(event=PageEvent(name="modal-terminate-reservation", clear=True)),
+            c.FireEvent(event=PageEvent(name=modal, clear=True)),
             c.FireEvent(event=GoToEvent(url=f"/reservations/{id}/log")),
         ]
     except TransitionNotAllowed as e:
         raise HTTPException(status_code=500, detail=str(e)) from e
 
 
+@router.post("/{id}/terminate", response_model=FastUI, response_model_exclude_none=True)
+def reservation_terminate(id: int) -> list[AnyComponent]:
+    """Terminate reservation with given id."""
+    return send_nsi_request(
+        id, lambda csm: csm.nsi_send_terminate(), nsi_send_terminate_job, "modal-terminate-reservation"
+    )
+
+
 @router.post("/{id}/release", response_model=FastUI, response_model_exclude_none=True)
-async def reservation_release(id: int) -> list[AnyComponent]:
+def reservation_release(id: int) -> list[AnyComponent]:
     """Release reservation with given id."""
-    try:
-        with Session.begin() as session:
-            reservation = session.query(Reservation).filter(Reservation.id == id).one()  # type: ignore[arg-type]
-            csm = ConnectionStateMachine(reservation)
-            csm.nsi_send_release()
-        scheduler.add_job(nsi_send_release_job, args=[id])
-        return [
-            c.FireEvent(event=PageEvent(name="modal-release-reservation", clear=True)),
-            c.FireEvent(event=GoToEvent(url=f"/reservations/{id}/log")),
-        ]
-    except TransitionNotAllowed as e:
-        raise HTTPException(status_code=500, detail=str(e)) from e
+    return send_nsi_request(id, lambda csm: csm.nsi_send_release(), nsi_send_release_job, "modal-release-reservation")
 
 
 @router.post("/{id}/provision", response_model=FastUI, response_model_exclude_none=True)
-async def reservation_provision(id: int) -> list[AnyComponent]:
+def reservation_provision(id: int) -> list[AnyComponent]:
     """Provision reservation with given id."""
-    try:
-        with Session.begin() as session:
-            reservation = session.query(Reservation).filter(Reservation.id == id).one()  # type: ignore[arg-type]
-            ConnectionStateMachine(reservation).nsi_send_provision()
-        scheduler.add_job(nsi_send_provision_job, args=[id])
-        return [
-            c.FireEvent(event=PageEvent(name="modal-provision-reservation", clear=True)),
-            c.FireEvent(event=GoToEvent(url=f"/reservations/{id}/log")),
-        ]
-    except TransitionNotAllowed as e:
-        raise HTTPException(status_code=500, detail=str(e)) from e
+    return send_nsi_request(
+        id, lambda csm: csm.nsi_send_provision(), nsi_send_provision_job, "modal-provision-reservation"
+    )
 
 
 @router.get("/all", response_model=FastUI, response_model_exclude_none=True)
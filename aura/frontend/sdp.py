@@ -13,7 +13,7 @@
 # limitations under the License.
 from typing import Annotated
 
-from fastapi import APIRouter
+from fastapi import APIRouter, Request, Response
 from fastui import AnyComponent, FastUI
 from fastui import components as c
 from fastui.components import FireEvent
@@ -22,11 +22,31 @@ from fastui.forms import fastui_form
 from pydantic import BaseModel, Field
 
 from aura.db import Session
-from aura.frontend.util import app_page, button_row, sdp_table
+from aura.frontend.util import active_tabs, app_page, button_row, not_modified, sdp_table
+from aura.job import invalidate_previous_topology_documents
 from aura.model import SDP
 
 router = APIRouter()
 
+# the detail page buttons do not depend on the SDP, build them once
+sdp_detail_buttons = button_row(
+    [
+        c.Button(
+            text="Back",
+            on_click=GoToEvent(url="/sdp"),
+            class_name="+ ms-2",
+        ),
+        # c.Button(
+        #     text="Modify",
+        #     on_click=GoToEvent(url=f"/sdp/{id}/modify"),
+        #     class_name="+ ms-2",
+        # ),
+    ]
+)
+sdp_details_heading = c.Heading(text="SDP details", level=4)
+stpa_details_heading = c.Heading(text="StpA details", level=4)
+stpz_details_heading = c.Heading(text="StpZ details", level=4)
+
 
 @router.get("", response_model=FastUI, response_model_exclude_none=True)
 async def sdp() -> list[AnyComponent]:
@@ -40,7 +60,7 @@ def sdp_active() -> list[AnyComponent]:
     with Session() as session:
         sdps = session.query(SDP).filter(SDP.active).order_by(SDP.id).all()
     return app_page(
-        *tabs(),
+        *active_tabs("/sdp"),
         sdp_table(sdps),
         title="Active Service Demarcation Points",
     )
@@ -52,7 +72,7 @@ def sdp_inactive() -> list[AnyComponent]:
     with Session() as session:
         sdps = session.query(SDP).filter(not SDP.active).order_by(SDP.id).all()
     return app_page(
-        *tabs(),
+        *active_tabs("/sdp"),
         sdp_table(sdps),
         title="Inctive Service Demarcation Points",
     )
@@ -64,39 +84,28 @@ def sdp_all() -> list[AnyComponent]:
     with Session() as session:
         sdps = session.query(SDP).order_by(SDP.id).all()
     return app_page(
-        *tabs(),
+        *active_tabs("/sdp"),
         sdp_table(sdps),
         title="All Service Demarcation Points",
     )
 
 
 @router.get("/{id}/", response_model=FastUI, response_model_exclude_none=True)
-def sdp_detail(id: int) -> list[AnyComponent]:
+def sdp_detail(id: int, request: Request, response: Response) -> list[AnyComponent] | Response:
     """Display sdp details and action buttons."""
     with Session() as session:
         sdp = session.query(SDP).filter(SDP.id == id).one_or_none()  # type: ignore[arg-type]
     if sdp is None:
         return app_page(title=f"No SDP with id {id}.")
+    if not_modified_response := not_modified(request, response, sdp, sdp.stpA, sdp.stpZ):
+        return not_modified_response
     return app_page(
-        button_row(
-            [
-                c.Button(
-                    text="Back",
-                    on_click=GoToEvent(url="/sdp"),
-                    class_name="+ ms-2",
-                ),
-                # c.Button(
-                #     text="Modify",
-                #     on_click=GoToEvent(url=f"/sdp/{id}/modify"),
-                #     class_name="+ ms-2",
-                # ),
-            ]
-        ),
-        c.Heading(text="SDP details", level=4),
+        sdp_detail_buttons,
+        sdp_details_heading,
         c.Details(data=sdp),
-        c.Heading(text="StpA details", level=4),
+        stpa_details_heading,
         c.Details(data=sdp.stpA),
-        c.Heading(text="StpZ details", level=4),
+        stpz_details_heading,
         c.Details(data=sdp.stpZ),
         title=f"SDP {sdp.description}",
     )
@@ -131,30 +140,6 @@ def sdp_update(id: int, form: Annotated[SdpUpdateForm, fastui_form(SdpUpdateForm
         sdp = session.query(SDP).filter(SDP.id == id).one_or_none()
         if sdp is not None:
             sdp.description = form.description
+    # the description is restored from the topology on the next DDS poll
+    invalidate_previous_topology_documents()
     return [c.FireEvent(event=GoToEvent(url=f"/sdp/{id}/"))]
-
-
-def tabs() -> list[AnyComponent]:
-    return [
-        c.LinkList(
-            links=[
-                c.Link(
-                    components=[c.Text(text="Active")],
-                    on_click=GoToEvent(url="/sdp/active"),
-                    active="startswith:/sdp/active",
-                ),
-                c.Link(
-                    components=[c.Text(text="Inactive")],
-                    on_click=GoToEvent(url="/sdp/inactive"),
-                    active="startswith:/sdp/inactive",
-                ),
-                c.Link(
-                    components=[c.Text(text="All")],
-                    on_click=GoToEvent(url="/sdp/all"),
-                    active="startswith:/sdp/all",
-                ),
-            ],
-            mode="tabs",
-            class_name="+ mb-4",
-        ),
-    ]
@@ -13,7 +13,7 @@
 # limitations under the License.
 from typing import Annotated
 
-from fastapi import APIRouter
+from fastapi import APIRouter, Request, Response
 from fastui import AnyComponent, FastUI
 from fastui import components as c
 from fastui.components import FireEvent
@@ -22,11 +22,28 @@ from fastui.forms import fastui_form
 from pydantic import BaseModel, Field
 
 from aura.db import Session
-from aura.frontend.util import app_page, button_row, stp_table
+from aura.frontend.util import active_tabs, app_page, button_row, not_modified, stp_table
+from aura.job import invalidate_previous_topology_documents
 from aura.model import STP
 
 router = APIRouter()
 
+# the detail page buttons do not depend on the STP, build them once
+stp_detail_buttons = button_row(
+    [
+        c.Button(
+            text="Back",
+            on_click=GoToEvent(url="/stp"),
+            class_name="+ ms-2",
+        ),
+        # c.Button(
+        #     text="Modify",
+        #     on_click=GoToEvent(url=f"/stp/{id}/modify"),
+        #     class_name="+ ms-2",
+        # ),
+    ]
+)
+
 
 @router.get("", response_model=FastUI, response_model_exclude_none=True)
 async def stp() -> list[AnyComponent]:
@@ -40,7 +57,7 @@ def stp_active() -> list[AnyComponent]:
     with Session() as session:
         stps = session.query(STP).filter(STP.active).order_by(STP.id).all()
     return app_page(
-        *tabs(),
+        *active_tabs("/stp"),
         stp_table(stps),
         title="Active Service Termination Points",
     )
@@ -52,7 +69,7 @@ def stp_inactive() -> list[AnyComponent]:
     with Session() as session:
         stps = session.query(STP).filter(not STP.active).order_by(STP.id).all()
     return app_page(
-        *tabs(),
+        *active_tabs("/stp"),
         stp_table(stps),
         title="Inctive Service Termination Points",
     )
@@ -64,34 +81,23 @@ def stp_all() -> list[AnyComponent]:
     with Session() as session:
         stps = session.query(STP).order_by(STP.id).all()
     return app_page(
-        *tabs(),
+        *active_tabs("/stp"),
         stp_table(stps),
         title="All Service Termination Points",
     )
 
 
 @router.get("/{id}/", response_model=FastUI, response_model_exclude_none=True)
-def stp_detail(id: int) -> list[AnyComponent]:
+def stp_detail(id: int, request: Request, response: Response) -> list[AnyComponent] | Response:
     """Display stp details and action buttons."""
     with Session() as session:
         stp = session.query(STP).filter(STP.id == id).one_or_none()  # type: ignore[arg-type]
     if stp is None:
         return app_page(title=f"No STP with id {id}.")
+    if not_modified_response := not_modified(request, response, stp):
+        return not_modified_response
     return app_page(
-        button_row(
-            [
-                c.Button(
-                    text="Back",
-                    on_click=GoToEvent(url="/stp"),
-                    class_name="+ ms-2",
-                ),
-                # c.Button(
-                #     text="Modify",
-                #     on_click=GoToEvent(url=f"/stp/{id}/modify"),
-                #     class_name="+ ms-2",
-                # ),
-            ]
-        ),
+        stp_detail_buttons,
         c.Details(data=stp),
         title=f"STP {stp.description}",
     )
@@ -126,30 +132,6 @@ def stp_update(id: int, form: Annotated[StpUpdateForm, fastui_form(StpUpdateForm
         stp = session.query(STP).filter(STP.id == id).one_or_none()
         if stp is not None:
             stp.description = form.description
+    # the description is restored from the topology on the next DDS poll
+    invalidate_previous_topology_documents()
     return [c.FireEvent(event=GoToEvent(url=f"/stp/{id}/"))]
-
-
-def tabs() -> list[AnyComponent]:
-    return [
-        c.LinkList(
-            links=[
-                c.Link(
-                    components=[c.Text(text="Active")],
-                    on_click=GoToEvent(url="/stp/active"),
-                    active="startswith:/stp/active",
-                ),
-                c.Link(
-                    components=[c.Text(text="Inactive")],
-                    on_click=GoToEvent(url="/stp/inactive"),
-                    active="startswith:/stp/inactive",
-                ),
-                c.Link(
-                    components=[c.Text(text="All")],
-                    on_click=GoToEvent(url="/stp/all"),
-                    active="startswith:/stp/all",
-                ),
-            ],
-            mode="tabs",
-            class_name="+ mb-4",
-        ),
-    ]
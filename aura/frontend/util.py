@@ -11,12 +11,17 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
+import importlib.metadata
+from functools import cache
+from hashlib import blake2s
 from typing import Any
 
+from fastapi import Request, Response
 from fastui import AnyComponent
 from fastui import components as c
 from fastui.components.display import DisplayLookup
 from fastui.events import GoToEvent, PageEvent
+from sqlmodel import SQLModel
 
 from aura.fsm import ConnectionStateMachine
 from aura.model import SDP, STP, Reservation
@@ -26,40 +31,79 @@ from aura.settings import settings
 c.Link.model_rebuild()
 
 
+# the navigation bar and footer are the same on every page, build them once and share them between responses
+app_navbar = c.Navbar(
+    title=settings.SITE_TITLE,
+    title_event=GoToEvent(url="/"),
+    start_links=[
+        c.Link(
+            components=[c.Text(text="Reservations")],
+            on_click=GoToEvent(url="/reservations/active"),
+            active="startswith:/reservations",
+        ),
+        c.Link(
+            components=[c.Text(text="STP")],
+            on_click=GoToEvent(url="/stp/active"),
+            active="startswith:/stp",
+        ),
+        c.Link(
+            components=[c.Text(text="SDP")],
+            on_click=GoToEvent(url="/sdp/active"),
+            active="startswith:/sdp",
+        ),
+        # c.Link(
+        #     components=[c.Text(text="Auth")],
+        #     on_click=GoToEvent(url="/auth/login/password"),
+        #     active="startswith:/auth",
+        # ),
+        # c.Link(
+        #     components=[c.Text(text="Forms")],
+        #     on_click=GoToEvent(url="/forms/login"),
+        #     active="startswith:/forms",
+        # ),
+    ],
+)
+
+app_footer = c.Footer(
+    extra_text="AURA PoC",
+    links=[
+        c.Link(
+            components=[c.Text(text="Github")],
+            on_click=GoToEvent(url="https://github.com/workfloworchestrator/nsi-aura/"),
+        ),
+    ],
+)
+
+
+# the page layout can change between releases, entity tags handed out by a previous release must not match,
+# salt with the release instead of something per process so that all workers hand out the same entity tags
+try:
+    _release = importlib.metadata.version("nsi-aura")
+except importlib.metadata.PackageNotFoundError:
+    # running from a source checkout that is not installed
+    _release = "unknown"
+
+
+def not_modified(request: Request, response: Response, *objects: SQLModel) -> Response | None:
+    """Set ETag derived from the objects shown on the page, return 304 response when client copy is still valid.
+
+    The client is asked to always revalidate its copy, a reservation page must never show a stale state.
+    """
+    # the page also shows the site title and links below the root path, a configuration change must not match either
+    digest = blake2s(repr((_release, settings.SITE_TITLE, settings.ROOT_PATH)).encode(), digest_size=8)
+    for obj in objects:
+        digest.update(repr(obj.model_dump()).encode())
+    headers = {"ETag": f'"{digest.hexdigest()}"', "Cache-Control": "private, no-cache"}
+    if request.headers.get("if-none-match") == headers["ETag"]:
+        return Response(status_code=304, headers=headers)
+    response.headers.update(headers)
+    return None
+
+
 def app_page(*components: AnyComponent, title: str | None = None) -> list[AnyComponent]:
     return [
         c.PageTitle(text=f"AURA — {title}" if title else "AURA PoC"),
-        c.Navbar(
-            title=settings.SITE_TITLE,
-            title_event=GoToEvent(url="/"),
-            start_links=[
-                c.Link(
-                    components=[c.Text(text="Reservations")],
-                    on_click=GoToEvent(url="/reservations/active"),
-                    active="startswith:/reservations",
-                ),
-                c.Link(
-                    components=[c.Text(text="STP")],
-                    on_click=GoToEvent(url="/stp/active"),
-                    active="startswith:/stp",
-                ),
-                c.Link(
-                    components=[c.Text(text="SDP")],
-                    on_click=GoToEvent(url="/sdp/active"),
-                    active="startswith:/sdp",
-                ),
-                # c.Link(
-                #     components=[c.Text(text="Auth")],
-                #     on_click=GoToEvent(url="/auth/login/password"),
-                #     active="startswith:/auth",
-                # ),
-                # c.Link(
-                #     components=[c.Text(text="Forms")],
-                #     on_click=GoToEvent(url="/forms/login"),
-                #     active="startswith:/forms",
-                # ),
-            ],
-        ),
+        app_navbar,
         c.Page(
             components=[
                 *((c.Heading(text=title),) if title else ()),
@@ -67,24 +111,22 @@ def app_page(*components: AnyComponent, title: str | None = None) -> list[AnyCom
                 aura_logo(),
             ],
         ),
-        c.Footer(
-            extra_text="AURA PoC",
-            links=[
-                c.Link(
-                    components=[c.Text(text="Github")],
-                    on_click=GoToEvent(url="https://github.com/workfloworchestrator/nsi-aura/"),
-                ),
-            ],
-        ),
+        app_footer,
     ]
 
 
 def aura_logo() -> AnyComponent:
+    return _aura_logo(settings.ROOT_PATH)
+
+
+@cache
+def _aura_logo(root_path: str) -> AnyComponent:
+    """Build the logo once per root path instead of for every response."""
     return c.Div(
         components=[
             c.Image(
                 # src='https://avatars.githubusercontent.com/u/110818415',
-                src=f"{settings.ROOT_PATH}/static/ANA-website-footer.png",
+                src=f"{root_path}/static/ANA-website-footer.png",
                 alt="ANA footer Logo",
                 width=900,
                 height=240,
@@ -231,6 +273,33 @@ def sdp_table(sdps: list[SDP]) -> c.Table:
     )
 
 
+def active_tabs(url: str) -> list[AnyComponent]:
+    """Create tabs to list the active, inactive or all items below url."""
+    return [
+        c.LinkList(
+            links=[
+                c.Link(
+                    components=[c.Text(text="Active")],
+                    on_click=GoToEvent(url=f"{url}/active"),
+                    active=f"startswith:{url}/active",
+                ),
+                c.Link(
+                    components=[c.Text(text="Inactive")],
+                    on_click=GoToEvent(url=f"{url}/inactive"),
+                    active=f"startswith:{url}/inactive",
+                ),
+                c.Link(
+                    components=[c.Text(text="All")],
+                    on_click=GoToEvent(url=f"{url}/all"),
+                    active=f"startswith:{url}/all",
+                ),
+            ],
+            mode="tabs",
+            class_name="+ mb-4",
+        ),
+    ]
+
+
 def reservation_tabs() -> list[AnyComponent]:
     return [
         c.LinkList(
@@ -298,15 +367,18 @@ def button_row(buttons: list[c.Button]) -> c.Div:
     return c.Div(components=buttons, class_name="d-flex flex-row gap-1 py-3")
 
 
+reservations_back_button = c.Button(
+    text="Back",
+    on_click=GoToEvent(url="/reservations"),
+    class_name="+ ms-2",
+)
+
+
 def reservation_buttons(reservation: Reservation) -> c.Div:
     csm = ConnectionStateMachine(reservation)
     return button_row(
         [
-            c.Button(
-                text="Back",
-                on_click=GoToEvent(url="/reservations"),
-                class_name="+ ms-2",
-            ),
+            reservations_back_button,
             c.Button(
                 text="Log",
                 on_click=GoToEvent(url=f"/reservations/{reservation.id}/log"),
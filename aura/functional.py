@@ -13,8 +13,7 @@
 
 """Assorted helper functions for representing the same data in different ways."""
 
-import itertools
-from typing import Iterable, List, Sequence, Set
+from typing import Iterable, List, Sequence, Set, Tuple
 
 import structlog
 
@@ -36,7 +35,7 @@ def expand_ranges(ranges: Sequence[Sequence[int]], inclusive: bool = False) -> L
     >>> expand_ranges([[]])
     Traceback (most recent call last):
         ...
-    ValueError: Expected 1 or 2 element list for range definition. Got f0 element list instead.
+    ValueError: Expected 1 or 2 element list for range definition. Got 0 element list instead.
 
     Resulting list is sorted::
 
@@ -61,7 +60,7 @@ def expand_ranges(ranges: Sequence[Sequence[int]], inclusive: bool = False) -> L
         elif r_len == 1:
             values.add(r[0])
         else:
-            raise ValueError(f"Expected 1 or 2 element list for range definition. Got f{len(r)} element list instead.")
+            raise ValueError(f"Expected 1 or 2 element list for range definition. Got {r_len} element list instead.")
     return sorted(values)
 
 
@@ -81,12 +80,61 @@ def to_ranges(i: Iterable[int]) -> Iterable[range]:
         range object for each consecutive set of integers
 
     """
-    # The trick here is the key function (the lambda one)
-    # that calculates the difference between an element of the iterable `i` and its corresponding enumeration value.
-    # For consecutive values in the iterable,
-    # this difference will be the same!
-    # All these values (those with the same difference) are grouped by the `groupby` function.
-    # We return the first and last element to construct a `range` object
-    for _, g in itertools.groupby(enumerate(i), lambda t: t[1] - t[0]):
-        group = list(g)
-        yield range(group[0][1], group[-1][1] + 1)
+    # Single pass that only remembers the start and the last seen value of the current run,
+    # a new run starts as soon as a value is not the direct successor of the previous one.
+    it = iter(i)
+    try:
+        start = stop = next(it)
+    except StopIteration:
+        return
+    for value in it:
+        if value != stop + 1:
+            yield range(start, stop + 1)
+            start = value
+        stop = value
+    yield range(start, stop + 1)
+
+
+def merge_ranges(ranges: Sequence[Sequence[int]], inclusive: bool = False) -> List[range]:
+    """Merge sequence of range definitions into a sorted list of non overlapping, non adjacent range objects.
+
+    Accepts the same range definitions as :func:`expand_ranges`,
+    but works on the range boundaries only instead of on every individual value,
+    so the cost depends on the number of range definitions and not on the size of the ranges.
+    The result is the same as ``list(to_ranges(expand_ranges(ranges, inclusive)))``.
+
+    >>> merge_ranges([[1], [2], [10, 12]], inclusive=True)
+    [range(1, 3), range(10, 13)]
+    >>> merge_ranges([[10, 14], [4], [11, 20]])
+    [range(4, 5), range(10, 20)]
+
+    Args:
+        ranges: sequence of range definitions
+        inclusive: are the stop values of the range definition inclusive or exclusive.
+
+    Returns:
+        Sorted list of merged range objects.
+
+    Raises:
+        ValueError: if range definition is not a one or two element sequence.
+
+    """
+    bounds: List[Tuple[int, int]] = []
+    for r in ranges:
+        if (r_len := len(r)) == 2:
+            start, stop = r[0], r[1] + (1 if inclusive else 0)
+        elif r_len == 1:
+            start, stop = r[0], r[0] + 1
+        else:
+            raise ValueError(f"Expected 1 or 2 element list for range definition. Got {r_len} element list instead.")
+        if start < stop:  # skip empty (and reversed) ranges, just like expand_ranges does
+            bounds.append((start, stop))
+    bounds.sort()
+    merged: List[range] = []
+    for start, stop in bounds:
+        if merged and start <= merged[-1].stop:
+            if stop > merged[-1].stop:
+                merged[-1] = range(merged[-1].start, stop)
+        else:
+            merged.append(range(start, stop))
+    return merged
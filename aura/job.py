@@ -11,6 +11,7 @@
 #  See the License for the specific language governing permissions and
 #  limitations under the License.
 
+from threading import Lock
 from uuid import UUID, uuid4
 
 import structlog
@@ -52,12 +53,42 @@ def new_correlation_id_on_reservation(reservation_id: int) -> None:
         reservation.correlationId = uuid4()
 
 
+# topology documents from the last DDS poll, guarded by the lock because
+# the STP and SDP endpoints invalidate them from the request threads
+_previous_topology_documents: dict[str, bytes] = {}
+_previous_topology_documents_lock = Lock()
+
+
 def nsi_poll_dds_job() -> None:
-    """Poll the DDS for topology documents and update STP and SDP."""
+    """Poll the DDS for topology documents and update STP and SDP.
+
+    Topologies change far less often than the DDS is polled,
+    skip parsing the documents and updating the database when they did not change since the last poll.
+    The documents are remembered before the update so that an invalidation during the update is not lost,
+    and forgotten again when the update fails.
+    """
+    global _previous_topology_documents
     documents = get_dds_documents(settings.NSI_DDS_URL)
-    stps = [stp for xml in documents[TOPOLOGY_MIME_TYPE].values() for stp in topology_to_stps(nsi_xml_to_dict(xml))]
-    update_stps(stps)
-    update_sdps()
+    topology_documents = documents[TOPOLOGY_MIME_TYPE]
+    with _previous_topology_documents_lock:
+        if topology_documents and topology_documents == _previous_topology_documents:
+            logger.debug("topology documents did not change")
+            return
+        _previous_topology_documents = topology_documents
+    try:
+        stps = [stp for xml in topology_documents.values() for stp in topology_to_stps(nsi_xml_to_dict(xml))]
+        update_stps(stps)
+        update_sdps()
+    except Exception:
+        invalidate_previous_topology_documents()
+        raise
+
+
+def invalidate_previous_topology_documents() -> None:
+    """Let the next DDS poll update STP and SDP, even when the topology documents did not change."""
+    global _previous_topology_documents
+    with _previous_topology_documents_lock:
+        _previous_topology_documents = {}
 
 
 def nsi_send_reserve_job(reservation_id: int) -> None:
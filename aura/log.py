@@ -12,8 +12,15 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import asyncio
+import atexit
+from collections import defaultdict
 from datetime import datetime
+from functools import partial
 from logging import Filter, Handler, LogRecord, config, getLogger
+from logging.handlers import QueueHandler, QueueListener
+from queue import SimpleQueue
+from threading import Lock
 from uuid import UUID
 
 import structlog
@@ -23,9 +30,55 @@ from aura.model import Log, Reservation
 from aura.settings import settings
 
 
+class LogMessageNotifier:
+    """Wake up asyncio tasks that wait for new log messages of a reservation.
+
+    Log messages are stored from any thread, including the scheduler threads,
+    so the futures are resolved through the event loop they belong to.
+    """
+
+    def __init__(self) -> None:
+        self._lock = Lock()
+        self._waiters: defaultdict[int, set[asyncio.Future[None]]] = defaultdict(set)
+
+    def waiter(self, reservation_id: int) -> asyncio.Future[None]:
+        """Return future that is resolved when the next log message for the reservation is stored."""
+        future: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        with self._lock:
+            self._waiters[reservation_id].add(future)
+        future.add_done_callback(partial(self._discard, reservation_id))
+        return future
+
+    def _discard(self, reservation_id: int, future: asyncio.Future[None]) -> None:
+        with self._lock:
+            if (waiters := self._waiters.get(reservation_id)) is not None:
+                waiters.discard(future)
+                if not waiters:
+                    del self._waiters[reservation_id]
+
+    def notify(self, reservation_id: int) -> None:
+        """Resolve all futures waiting for a log message for the reservation."""
+        with self._lock:
+            waiters = list(self._waiters.get(reservation_id, ()))
+        for future in waiters:
+            try:
+                future.get_loop().call_soon_threadsafe(_resolve, future)
+            except RuntimeError:  # event loop already closed
+                pass
+
+
+def _resolve(future: asyncio.Future[None]) -> None:
+    if not future.done():
+        future.set_result(None)
+
+
+log_message_notifier = LogMessageNotifier()
+
+
 class DatabaseLogHandler(Handler):
     def emit(self, record: LogRecord) -> None:
         """Filter structlog generated messages and store reservation related ones in the database."""
+        reservationId = -1
         with Session.begin() as session:
             # when msg attribute exists and is a dict, then the message is generated by structlog
             if hasattr(record, "msg") and isinstance(record.msg, dict):
@@ -66,6 +119,27 @@ class DatabaseLogHandler(Handler):
                             message=record.msg["event"],
                         )
                     )
+        # wake up log streams only after the message is committed
+        if reservationId >= 0:
+            log_message_notifier.notify(reservationId)
+
+
+class QueueDatabaseLogHandler(QueueHandler):
+    """Hand log records over to a background thread that stores them with DatabaseLogHandler.
+
+    Logging from the event loop or a scheduler job must not wait for a database commit.
+    """
+
+    def __init__(self) -> None:
+        super().__init__(SimpleQueue())
+        self.listener = QueueListener(self.queue, DatabaseLogHandler())
+        self.listener.start()
+        # store the records that are still queued before the logging handlers are shut down
+        atexit.register(self.listener.stop)
+
+    def prepare(self, record: LogRecord) -> LogRecord:
+        """Pass on the record unchanged, DatabaseLogHandler needs the structlog event dict."""
+        return record
 
 
 class UvicornAccessLogFilter(Filter):
@@ -139,7 +213,8 @@ def init() -> None:
                 },
                 "database": {
                     "level": "DEBUG",
-                    "class": "aura.log.DatabaseLogHandler",
+                    # use a factory, with "class" dictConfig would replace the queue and listener of a QueueHandler
+                    "()": "aura.log.QueueDatabaseLogHandler",
                     "formatter": "plain",
                 },
             },
@@ -198,6 +273,8 @@ def init() -> None:
 
     structlog.configure(
         processors=[
+            # drop messages below the configured log level before any other processor does work on them
+            structlog.stdlib.filter_by_level,
             structlog.stdlib.add_log_level,
             structlog.stdlib.add_logger_name,
             structlog.stdlib.PositionalArgumentsFormatter(),
@@ -13,6 +13,9 @@
 # limitations under the License.
 
 from datetime import datetime, timedelta, timezone
+from functools import cached_property
+from pathlib import Path
+from string import Template
 from typing import Any
 from uuid import UUID, uuid4
 
@@ -28,11 +31,6 @@ from aura.settings import settings
 
 logger = structlog.get_logger(__name__)
 
-#
-# Module-only variables
-#
-FIND_ANYWHERE_PREFIX = ".//"
-
 #
 # All items parsed from XML/SOAP get a numerical id about the order in which they were found
 # in the XML
@@ -175,90 +173,35 @@ NSI_RESERVE_XML_CONNECTION_PREFIX = "ANA-GRAM Connection"
 # DONE: providerNSA in all msgs set to value from NSA id from /discovery
 
 # TODO: capacity
-message_keys = [
-    "#CORRELATION-ID#",  # urn:uuid:a3eb6740-7227-473b-af6f-6705d489407c
-    "#REPLY-TO-URL#",  # http://127.0.0.1:7080/NSI/services/RequesterService2
-    "#CONNECTION-DESCRIPTION#",  # string w/spaces
-    "#GLOBAL-RESERVATION-ID#",  # urn:uuid:c46b7412-2263-46c6-b497-54f52e9f9ff4
-    "#CONNECTION-START-TIME#",  # 2024-09-26T12:00:00+00:00  # ARNO: no timezone?
-    "#CONNECTION-END-TIME#",  # 2024-09-26T22:00:00+00:00
-    "#SOURCE-STP#",  # urn:ogf:network:example.domain:2001:topology:port12?vlan=1002
-    "#DEST-STP#",  # urn:ogf:network:example.domain:2001:topology:port12?vlan=1002
-    "#PROVIDER-NSA-ID#",  # urn:ogf:network:example.domain:2001:nsa:supa
-]
 
 
 # RESERVE COMMIT
 NSI_RESERVE_COMMIT_TEMPLATE_XMLFILE = "ReserveCommit.xml"
 
-reserve_commit_keys = [
-    "#CORRELATION-ID#",  # urn:uuid:a3eb6740-7227-473b-af6f-6705d489407c
-    "#REPLY-TO-URL#",  # http://127.0.0.1:7080/NSI/services/RequesterService2
-    "#CONNECTION-ID#",  # note: no urn prefix: 2d71c50b-a6ff-46e5-8e37-567470ba832a
-    "#PROVIDER-NSA-ID#",  # urn:ogf:network:example.domain:2001:nsa:supa
-]
-
 
 # RESERVE ABORT
 NSI_RESERVE_ABORT_TEMPLATE_XMLFILE = "ReserveAbort.xml"
 
-reserve_abort_keys = [
-    "#CORRELATION-ID#",  # urn:uuid:a3eb6740-7227-473b-af6f-6705d489407c
-    "#REPLY-TO-URL#",  # http://127.0.0.1:7080/NSI/services/RequesterService2
-    "#CONNECTION-ID#",  # note: no urn prefix: 2d71c50b-a6ff-46e5-8e37-567470ba832a
-    "#PROVIDER-NSA-ID#",  # urn:ogf:network:example.domain:2001:nsa:supa
-]
-
 
 # PROVISION
 NSI_PROVISION_TEMPLATE_XMLFILE = "Provision.xml"
 
-provision_keys = [
-    "#CORRELATION-ID#",  # urn:uuid:a3eb6740-7227-473b-af6f-6705d489407c
-    "#REPLY-TO-URL#",  # http://127.0.0.1:7080/NSI/services/RequesterService2
-    "#CONNECTION-ID#",  # note: no urn prefix: 2d71c50b-a6ff-46e5-8e37-567470ba832a
-    "#PROVIDER-NSA-ID#",  # urn:ogf:network:example.domain:2001:nsa:supa
-]
 
 # TERMINATE
 NSI_TERMINATE_TEMPLATE_XMLFILE = "Terminate.xml"
 
-terminate_keys = [
-    "#CORRELATION-ID#",  # urn:uuid:a3eb6740-7227-473b-af6f-6705d489407c
-    "#REPLY-TO-URL#",  # http://127.0.0.1:7080/NSI/services/RequesterService2
-    "#CONNECTION-ID#",  # note: no urn prefix: 2d71c50b-a6ff-46e5-8e37-567470ba832a
-    "#PROVIDER-NSA-ID#",  # urn:ogf:network:example.domain:2001:nsa:supa
-]
-
 
 # RELEASE
 NSI_RELEASE_TEMPLATE_XMLFILE = "Release.xml"
 
-release_keys = [
-    "#CORRELATION-ID#",  # urn:uuid:a3eb6740-7227-473b-af6f-6705d489407c
-    "#REPLY-TO-URL#",  # http://127.0.0.1:7080/NSI/services/RequesterService2
-    "#CONNECTION-ID#",  # note: no urn prefix: 2d71c50b-a6ff-46e5-8e37-567470ba832a
-    "#PROVIDER-NSA-ID#",  # urn:ogf:network:example.domain:2001:nsa:supa
-]
-
 
 # RESERVE_TIMEOUT_ACK
 NSI_RESERVE_TIMEOUT_ACK_TEMPLATE_XMLFILE = "ReserveTimeoutACK.xml"
 
-reserve_timeout_ack_keys = [
-    "#CORRELATION-ID#",  # urn:uuid:a3eb6740-7227-473b-af6f-6705d489407c
-    "#REPLY-TO-URL#",  # http://127.0.0.1:7080/NSI/services/RequesterService2
-    "#CONNECTION-ID#",  # note: no urn prefix: 2d71c50b-a6ff-46e5-8e37-567470ba832a
-    "#PROVIDER-NSA-ID#",  # urn:ogf:network:example.domain:2001:nsa:supa
-]
 
 # ACKNOWLEDGEMENT
 NSI_ACKNOWLEDGEMENT_TEMPLATE_XMLFILE = "GenericAcknowledgement.xml"
 
-acknowledgement_keys = [
-    "#CORRELATION-ID#",  # urn:uuid:a3eb6740-7227-473b-af6f-6705d489407c
-    "#PROVIDER-NSA-ID#",  # urn:ogf:network:example.domain:2001:nsa:supa
-]
 
 # QUERY
 NSI_QUERY_SUMMARY_SYNC_TEMPLATE_XMLFILE = "QuerySummarySync.xml"
@@ -267,98 +210,64 @@ NSI_QUERY_SUMMARY_SYNC_TEMPLATE_XMLFILE = "QuerySummarySync.xml"
 #      <connectionId>af7e02ef-608a-42d7-89b3-9f701051a58e</connectionId>
 #      <ifModifiedSince>2022-09-01T14:50:46.767879+00:00</ifModifiedSince>
 #     <globalReservationId>76cc6c3c-a126-4174-8016-11f00012ec1d</globalReservationId>
-query_summary_sync_keys = [
-    "#CORRELATION-ID#",  # urn:uuid:a3eb6740-7227-473b-af6f-6705d489407c
-    "#CONNECTION-ID#",  # note: no urn prefix: 2d71c50b-a6ff-46e5-8e37-567470ba832a
-    "#PROVIDER-NSA-ID#",  # urn:ogf:network:example.domain:2001:nsa:supa
-]
 
 
 # QUERY_RECURSIVE
 NSI_QUERY_RECURSIVE_TEMPLATE_XMLFILE = "QueryRecursive.xml"
 
-query_recursive_keys = [
-    "#CORRELATION-ID#",  # urn:uuid:a3eb6740-7227-473b-af6f-6705d489407c
-    "#REPLY-TO-URL#",  # http://127.0.0.1:7080/NSI/services/RequesterService2
-    "#CONNECTION-ID#",  # note: no urn prefix: 2d71c50b-a6ff-46e5-8e37-567470ba832a
-    "#PROVIDER-NSA-ID#",  # urn:ogf:network:example.domain:2001:nsa:supa
-]
 
 # Templates
 #
-# RESERVE
-reserve_template_path = settings.STATIC_DIRECTORY / NSI_RESERVE_TEMPLATE_XMLFILE
+class SoapTemplate(Template):
+    """SOAP message template with placeholders of the form #PLACEHOLDER-NAME#."""
 
-# Read Reserve template code
-with reserve_template_path.open() as reserve_template_file:
-    reserve_template = reserve_template_file.read()
-
-# RESERVE-COMMIT
-reserve_commit_template_path = settings.STATIC_DIRECTORY / NSI_RESERVE_COMMIT_TEMPLATE_XMLFILE
-
-# Read Reserve Commit template code
-with reserve_commit_template_path.open() as reserve_commit_template_file:
-    reserve_commit_template = reserve_commit_template_file.read()
-
-# RESERVE-ABORT
-reserve_abort_template_path = settings.STATIC_DIRECTORY / NSI_RESERVE_ABORT_TEMPLATE_XMLFILE
-
-# Read Reserve Abort template code
-with reserve_abort_template_path.open() as reserve_abort_template_file:
-    reserve_abort_template = reserve_abort_template_file.read()
-
-# PROVISION
-provision_template_path = settings.STATIC_DIRECTORY / NSI_PROVISION_TEMPLATE_XMLFILE
-
-# Read Reserve template code
-with provision_template_path.open() as provision_template_file:
-    provision_template = provision_template_file.read()
-
-# QUERY SUMMARY SYNC
-query_summary_sync_template_path = settings.STATIC_DIRECTORY / NSI_QUERY_SUMMARY_SYNC_TEMPLATE_XMLFILE
-
-# Read Reserve template code
-with query_summary_sync_template_path.open() as query_summary_sync_template_file:
-    query_summary_sync_template = query_summary_sync_template_file.read()
+    # Template compiles this pattern in verbose mode, a lone # that is not part of a placeholder is left as is
+    pattern = r"""
+    \#(?:
+      (?P<named>[A-Z][A-Z-]*)\#  |
+      (?P<escaped>(?!))           |
+      (?P<braced>(?!))            |
+      (?P<invalid>(?!))
+    )
+    """  # type: ignore[assignment]
 
-# QUERY RECURSIVE to get path details
-query_recursive_template_path = settings.STATIC_DIRECTORY / NSI_QUERY_RECURSIVE_TEMPLATE_XMLFILE
 
-# Read RESERVE_TIMEOUT_ACK template code
-with query_recursive_template_path.open() as query_recursive_template_file:
-    query_recursive_template = query_recursive_template_file.read()
+class SoapTemplateFile:
+    """SOAP message template file that is only read when it is used for the first time."""
 
-# TERMINATE
-terminate_template_path = settings.STATIC_DIRECTORY / NSI_TERMINATE_TEMPLATE_XMLFILE
+    def __init__(self, path: Path) -> None:
+        # still fail at startup on a missing template instead of on first use
+        if not path.is_file():
+            raise FileNotFoundError(f"SOAP message template {path} not found")
+        self.path = path
 
-# Read TERMINATE template code
-with terminate_template_path.open() as terminate_template_file:
-    terminate_template = terminate_template_file.read()
+    @cached_property
+    def template(self) -> SoapTemplate:
+        return SoapTemplate(self.path.read_text())
 
-# RELEASE
-release_template_path = settings.STATIC_DIRECTORY / NSI_RELEASE_TEMPLATE_XMLFILE
+    def substitute(self, mapping: dict[str, str]) -> str:
+        return self.template.substitute(mapping)
 
-# Read RELEASE template code
-with release_template_path.open() as release_template_file:
-    release_template = release_template_file.read()
 
-# RESERVE_TIMEOUT_ACK
-reserve_timeout_ack_template_path = settings.STATIC_DIRECTORY / NSI_RESERVE_TIMEOUT_ACK_TEMPLATE_XMLFILE
+def soap_template(template_xmlfile: str) -> SoapTemplateFile:
+    """SOAP message template from the static directory."""
+    return SoapTemplateFile(settings.STATIC_DIRECTORY / template_xmlfile)
 
-# Read RESERVE_TIMEOUT_ACK template code
-with reserve_timeout_ack_template_path.open() as reserve_timeout_ack_template_file:
-    reserve_timeout_ack_template = reserve_timeout_ack_template_file.read()
 
-# ACKNOWLEDGEMENT
-acknowledgement_template_path = settings.STATIC_DIRECTORY / NSI_ACKNOWLEDGEMENT_TEMPLATE_XMLFILE
-
-# Read ACKNOWLEDGEMENT template code
-with acknowledgement_template_path.open() as acknowledgement_template_file:
-    acknowledgement_template = acknowledgement_template_file.read()
+reserve_template = soap_template(NSI_RESERVE_TEMPLATE_XMLFILE)
+reserve_commit_template = soap_template(NSI_RESERVE_COMMIT_TEMPLATE_XMLFILE)
+reserve_abort_template = soap_template(NSI_RESERVE_ABORT_TEMPLATE_XMLFILE)
+provision_template = soap_template(NSI_PROVISION_TEMPLATE_XMLFILE)
+query_summary_sync_template = soap_template(NSI_QUERY_SUMMARY_SYNC_TEMPLATE_XMLFILE)
+query_recursive_template = soap_template(NSI_QUERY_RECURSIVE_TEMPLATE_XMLFILE)
+terminate_template = soap_template(NSI_TERMINATE_TEMPLATE_XMLFILE)
+release_template = soap_template(NSI_RELEASE_TEMPLATE_XMLFILE)
+reserve_timeout_ack_template = soap_template(NSI_RESERVE_TIMEOUT_ACK_TEMPLATE_XMLFILE)
+acknowledgement_template = soap_template(NSI_ACKNOWLEDGEMENT_TEMPLATE_XMLFILE)
 
 
 def generate_reserve_xml(
-    message_template: str,
+    message_template: SoapTemplateFile,
     correlation_uuid_py: UUID,
     reply_to_url: str,
     connection_descr: str,
@@ -376,198 +285,206 @@ def generate_reserve_xml(
     end_time_str = end_datetime_py.isoformat()
 
     message_dict = {
-        "#CORRELATION-ID#": correlation_urn,
-        "#REPLY-TO-URL#": reply_to_url,
-        "#CONNECTION-DESCRIPTION#": connection_descr,
-        "#GLOBAL-RESERVATION-ID#": global_reservation_urn,
-        "#CONNECTION-START-TIME#": start_time_str,
-        "#CONNECTION-END-TIME#": end_time_str,
-        "#SOURCE-STP#": source_stp,
-        "#DEST-STP#": dest_stp,
-        "#PROVIDER-NSA-ID#": provider_nsa_id,
+        "CORRELATION-ID": correlation_urn,  # urn:uuid:a3eb6740-7227-473b-af6f-6705d489407c
+        "REPLY-TO-URL": reply_to_url,  # http://127.0.0.1:7080/NSI/services/RequesterService2
+        "CONNECTION-DESCRIPTION": connection_descr,  # string w/spaces
+        "GLOBAL-RESERVATION-ID": global_reservation_urn,  # urn:uuid:c46b7412-2263-46c6-b497-54f52e9f9ff4
+        "CONNECTION-START-TIME": start_time_str,  # 2024-09-26T12:00:00+00:00
+        "CONNECTION-END-TIME": end_time_str,  # 2024-09-26T22:00:00+00:00
+        "SOURCE-STP": source_stp,  # urn:ogf:network:example.domain:2001:topology:port12?vlan=1002
+        "DEST-STP": dest_stp,  # urn:ogf:network:example.domain:2001:topology:port12?vlan=1002
+        "PROVIDER-NSA-ID": provider_nsa_id,  # urn:ogf:network:example.domain:2001:nsa:supa
     }
 
-    message_xml = message_template
-    for message_key in message_keys:
-        message_xml = message_xml.replace(message_key, message_dict[message_key])
+    message_xml = message_template.substitute(message_dict)
 
     return message_xml.encode()
 
 
 def generate_reserve_commit_xml(
-    message_template: str, correlation_uuid_py: UUID, reply_to_url: str, connid_str: str, provider_nsa_id: str
+    message_template: SoapTemplateFile,
+    correlation_uuid_py: UUID,
+    reply_to_url: str,
+    connid_str: str,
+    provider_nsa_id: str,
 ) -> bytes:
     # Generate values
     correlation_urn = URN_UUID_PREFIX + str(correlation_uuid_py)
 
     message_dict = {
-        "#CORRELATION-ID#": correlation_urn,
-        "#REPLY-TO-URL#": reply_to_url,
-        "#CONNECTION-ID#": connid_str,
-        "#PROVIDER-NSA-ID#": provider_nsa_id,
+        "CORRELATION-ID": correlation_urn,
+        "REPLY-TO-URL": reply_to_url,
+        "CONNECTION-ID": connid_str,
+        "PROVIDER-NSA-ID": provider_nsa_id,
     }
 
-    message_xml = message_template
-    for message_key in reserve_commit_keys:
-        message_xml = message_xml.replace(message_key, message_dict[message_key])
+    message_xml = message_template.substitute(message_dict)
 
     return message_xml.encode()
 
 
 def generate_reserve_abort_xml(
-    message_template: str, correlation_uuid_py: UUID, reply_to_url: str, connid_str: str, provider_nsa_id: str
+    message_template: SoapTemplateFile,
+    correlation_uuid_py: UUID,
+    reply_to_url: str,
+    connid_str: str,
+    provider_nsa_id: str,
 ) -> bytes:
     # Generate values
     correlation_urn = URN_UUID_PREFIX + str(correlation_uuid_py)
 
     message_dict = {
-        "#CORRELATION-ID#": correlation_urn,
-        "#REPLY-TO-URL#": reply_to_url,
-        "#CONNECTION-ID#": connid_str,
-        "#PROVIDER-NSA-ID#": provider_nsa_id,
+        "CORRELATION-ID": correlation_urn,
+        "REPLY-TO-URL": reply_to_url,
+        "CONNECTION-ID": connid_str,
+        "PROVIDER-NSA-ID": provider_nsa_id,
     }
 
-    message_xml = message_template
-    for message_key in reserve_commit_keys:
-        message_xml = message_xml.replace(message_key, message_dict[message_key])
+    message_xml = message_template.substitute(message_dict)
 
     return message_xml.encode()
 
 
 def generate_provision_xml(
-    message_template: str, correlation_uuid_py: UUID, reply_to_url: str, connid_str: str, provider_nsa_id: str
+    message_template: SoapTemplateFile,
+    correlation_uuid_py: UUID,
+    reply_to_url: str,
+    connid_str: str,
+    provider_nsa_id: str,
 ) -> bytes:
     # Generate values
     correlation_urn = URN_UUID_PREFIX + str(correlation_uuid_py)
 
     message_dict = {
-        "#CORRELATION-ID#": correlation_urn,
-        "#REPLY-TO-URL#": reply_to_url,
-        "#CONNECTION-ID#": connid_str,
-        "#PROVIDER-NSA-ID#": provider_nsa_id,
+        "CORRELATION-ID": correlation_urn,
+        "REPLY-TO-URL": reply_to_url,
+        "CONNECTION-ID": connid_str,
+        "PROVIDER-NSA-ID": provider_nsa_id,
     }
 
-    message_xml = message_template
-    for message_key in provision_keys:
-        message_xml = message_xml.replace(message_key, message_dict[message_key])
+    message_xml = message_template.substitute(message_dict)
 
     return message_xml.encode()
 
 
 def generate_terminate_xml(
-    message_template: str, correlation_uuid_py: UUID, reply_to_url: str, connid_str: str, provider_nsa_id: str
+    message_template: SoapTemplateFile,
+    correlation_uuid_py: UUID,
+    reply_to_url: str,
+    connid_str: str,
+    provider_nsa_id: str,
 ) -> bytes:
     # Generate values
     correlation_urn = URN_UUID_PREFIX + str(correlation_uuid_py)
 
     message_dict = {
-        "#CORRELATION-ID#": correlation_urn,
-        "#REPLY-TO-URL#": reply_to_url,
-        "#CONNECTION-ID#": connid_str,
-        "#PROVIDER-NSA-ID#": provider_nsa_id,
+        "CORRELATION-ID": correlation_urn,
+        "REPLY-TO-URL": reply_to_url,
+        "CONNECTION-ID": connid_str,
+        "PROVIDER-NSA-ID": provider_nsa_id,
     }
 
-    message_xml = message_template
-    for message_key in terminate_keys:
-        message_xml = message_xml.replace(message_key, message_dict[message_key])
+    message_xml = message_template.substitute(message_dict)
 
     return message_xml.encode()
 
 
 def generate_release_xml(
-    message_template: str, correlation_uuid_py: UUID, reply_to_url: str, connid_str: str, provider_nsa_id: str
+    message_template: SoapTemplateFile,
+    correlation_uuid_py: UUID,
+    reply_to_url: str,
+    connid_str: str,
+    provider_nsa_id: str,
 ) -> bytes:
     # Generate values
     correlation_urn = URN_UUID_PREFIX + str(correlation_uuid_py)
 
     message_dict = {
-        "#CORRELATION-ID#": correlation_urn,
-        "#REPLY-TO-URL#": reply_to_url,
-        "#CONNECTION-ID#": connid_str,
-        "#PROVIDER-NSA-ID#": provider_nsa_id,
+        "CORRELATION-ID": correlation_urn,
+        "REPLY-TO-URL": reply_to_url,
+        "CONNECTION-ID": connid_str,
+        "PROVIDER-NSA-ID": provider_nsa_id,
     }
 
-    message_xml = message_template
-    for message_key in terminate_keys:
-        message_xml = message_xml.replace(message_key, message_dict[message_key])
+    message_xml = message_template.substitute(message_dict)
 
     return message_xml.encode()
 
 
 def generate_reserve_timeout_ack_xml(
-    message_template: str, correlation_uuid_py: UUID, reply_to_url: str, connid_str: str, provider_nsa_id: str
+    message_template: SoapTemplateFile,
+    correlation_uuid_py: UUID,
+    reply_to_url: str,
+    connid_str: str,
+    provider_nsa_id: str,
 ) -> bytes:
     # Generate values
     correlation_urn = URN_UUID_PREFIX + str(correlation_uuid_py)
 
     message_dict = {
-        "#CORRELATION-ID#": correlation_urn,
-        "#REPLY-TO-URL#": reply_to_url,
-        "#CONNECTION-ID#": connid_str,
-        "#PROVIDER-NSA-ID#": provider_nsa_id,
+        "CORRELATION-ID": correlation_urn,
+        "REPLY-TO-URL": reply_to_url,
+        "CONNECTION-ID": connid_str,
+        "PROVIDER-NSA-ID": provider_nsa_id,
     }
 
-    message_xml = message_template
-    for message_key in terminate_keys:
-        message_xml = message_xml.replace(message_key, message_dict[message_key])
+    message_xml = message_template.substitute(message_dict)
 
     return message_xml.encode()
 
 
-def generate_acknowledgement_xml(message_template: str, correlation_uuid_py: UUID, provider_nsa_id: str) -> bytes:
+def generate_acknowledgement_xml(
+    message_template: SoapTemplateFile, correlation_uuid_py: UUID, provider_nsa_id: str
+) -> bytes:
     # Generate values
     correlation_urn = URN_UUID_PREFIX + str(correlation_uuid_py)
 
     message_dict = {
-        "#CORRELATION-ID#": correlation_urn,
-        "#PROVIDER-NSA-ID#": provider_nsa_id,
+        "CORRELATION-ID": correlation_urn,
+        "PROVIDER-NSA-ID": provider_nsa_id,
     }
 
-    message_xml = message_template
-    for message_key in acknowledgement_keys:
-        message_xml = message_xml.replace(message_key, message_dict[message_key])
+    message_xml = message_template.substitute(message_dict)
 
     return message_xml.encode()
 
 
 def generate_query_summary_sync_xml(
-    message_template: str, correlation_uuid_py: UUID, connid_str: str, provider_nsa_id: str
+    message_template: SoapTemplateFile, correlation_uuid_py: UUID, connid_str: str, provider_nsa_id: str
 ) -> bytes:
     # Generate values
-    log = logger.bind()
-
     correlation_urn = URN_UUID_PREFIX + str(correlation_uuid_py)
 
     message_dict = {
-        "#CORRELATION-ID#": correlation_urn,
-        "#CONNECTION-ID#": connid_str,
-        "#PROVIDER-NSA-ID#": provider_nsa_id,
+        "CORRELATION-ID": correlation_urn,
+        "CONNECTION-ID": connid_str,
+        "PROVIDER-NSA-ID": provider_nsa_id,
     }
 
-    message_xml = message_template
-    for message_key in query_summary_sync_keys:
-        message_xml = message_xml.replace(message_key, message_dict[message_key])
+    message_xml = message_template.substitute(message_dict)
 
-    log.debug("QUERY_XML", message_xml=message_xml)
+    logger.debug("QUERY_XML", message_xml=message_xml)
     return message_xml.encode()
 
 
 def generate_query_recursive_xml(
-    message_template: str, correlation_uuid_py: UUID, reply_to_url: str, connid_str: str, provider_nsa_id: str
+    message_template: SoapTemplateFile,
+    correlation_uuid_py: UUID,
+    reply_to_url: str,
+    connid_str: str,
+    provider_nsa_id: str,
 ) -> bytes:
     # Generate values
     correlation_urn = URN_UUID_PREFIX + str(correlation_uuid_py)
 
     message_dict = {
-        "#CORRELATION-ID#": correlation_urn,
-        "#REPLY-TO-URL#": reply_to_url,
-        "#CONNECTION-ID#": connid_str,
-        "#PROVIDER-NSA-ID#": provider_nsa_id,
+        "CORRELATION-ID": correlation_urn,
+        "REPLY-TO-URL": reply_to_url,
+        "CONNECTION-ID": connid_str,
+        "PROVIDER-NSA-ID": provider_nsa_id,
     }
 
-    message_xml = message_template
-    for message_key in terminate_keys:
-        message_xml = message_xml.replace(message_key, message_dict[message_key])
+    message_xml = message_template.substitute(message_dict)
 
     return message_xml.encode()
 
@@ -576,6 +493,10 @@ def generate_query_recursive_xml(
 # Library
 #
 
+# one parser for all NSI and DDS documents, entities are not expanded and no network access is done while parsing,
+# lxml serialises the use of a parser between threads
+xml_parser = etree.XMLParser(resolve_entities=False, no_network=True, huge_tree=False)
+
 requests_session_adapter = requests.adapters.HTTPAdapter(max_retries=Retry(connect=3, backoff_factor=0.1))
 session = requests.Session()
 session.mount("http://", requests_session_adapter)
@@ -583,32 +504,27 @@ session.mount("https://", requests_session_adapter)
 
 
 def nsi_util_get_xml(url: HttpUrl) -> bytes | None:
-    log = logger.bind()
+    log = logger.bind(url=str(url))
 
     # throws Exception to higher layer for display to user
-    log.debug("SENDING HTTP REQUEST FOR XML", url=str(url))
+    log.debug("SENDING HTTP REQUEST FOR XML")
     # 2024-11-08: SuPA moxy currently has self-signed certificate
     try:
         r = session.get(
             str(url),
             verify=settings.verify,
-            cert=(str(settings.NSI_AURA_CERTIFICATE), str(settings.NSI_AURA_PRIVATE_KEY)),
+            cert=settings.cert,
         )
-    except requests.exceptions.ConnectionError as e:
-        log.warning("cannot get XML document", url=str(url), error=str(e))
+    except requests.exceptions.RequestException as e:
+        log.warning("cannot get XML document", error=str(e))
         return None
-    # logger.debug log.debug(r.status_code)
-    # logger.debug log.debug(r.headers['content-type'])
-    # logger.debug log.debug(r.encoding)
-    log.debug(r.status_code)
-    log.debug(r.headers.get("content-type"))
-    log.debug(r.encoding)
-    log.debug(r.content)
-    # except:
-    #    log.debug("nsi_util_get_and_parse_xml: error talking to "+url,file=sys.stderr)
-    #    traceback.print_exc()
-    #    return None
-
+    # pass response details as key/value pairs, they are only rendered when debug logging is enabled
+    log.debug(
+        "RECEIVED HTTP RESPONSE FOR XML",
+        status_code=r.status_code,
+        content_type=r.headers.get("content-type"),
+        content=r.content,
+    )
     if r.status_code != 200:
         log.warning(f"{url} returned {r.status_code} with message {r.reason}")
         return None
@@ -771,10 +687,7 @@ def nsi_util_get_xml(url: HttpUrl) -> bytes | None:
 
 def nsi_util_element_to_dict(node: Any, attributes: bool = True) -> dict[str, Any]:
     """Convert a lxml.etree node tree into a dict."""
-    result = {}
-    if attributes:
-        for item in node.attrib.items():
-            key, result[key] = item
+    result: dict[str, Any] = dict(node.attrib) if attributes else {}
 
     for element in node.iterchildren():
         # Remove namespace prefix
@@ -801,18 +714,31 @@ def nsi_util_element_to_dict(node: Any, attributes: bool = True) -> dict[str, An
     return result
 
 
+def find_anywhere(tree: etree._Element, tag: str) -> etree._Element | None:
+    """Return first element below tree with given tag, or None when not found.
+
+    Same as tree.find(".//" + tag) but without going through the ElementPath machinery.
+    """
+    return next(tree.iterdescendants(tag), None)
+
+
 def nsi_xml_to_dict(xml: bytes) -> dict[Any, Any]:
     """Convert XML string to dict."""
-    return nsi_util_element_to_dict(etree.fromstring(xml))
+    return nsi_util_element_to_dict(etree.fromstring(xml, xml_parser))
 
 
 #
 # SOAP functions
 #
+SOAP_MEDIA_TYPES = frozenset({"application/xml", "text/xml"})
+
+
 def content_type_is_valid_soap(content_type: str) -> bool:
-    """Validate that HTTP Content-Type indicates SOAP."""
-    ct = content_type.lower()
-    return ct == "application/xml" or ct.startswith("text/xml")  # "text/xml;charset=utf-8" "text/xml; charset=UTF-8"
+    """Validate that HTTP Content-Type indicates SOAP.
+
+    Parameters like charset are ignored, "text/xml;charset=utf-8" and "text/xml; charset=UTF-8" are both valid.
+    """
+    return content_type.partition(";")[0].strip().lower() in SOAP_MEDIA_TYPES
 
 
 def nsi_util_post_soap(url: HttpUrl, soapreqmsg: bytes) -> bytes:
@@ -820,7 +746,7 @@ def nsi_util_post_soap(url: HttpUrl, soapreqmsg: bytes) -> bytes:
 
     Returns: response.content, a SOAP reply.
     """
-    log = logger.bind()
+    log = logger.bind(url=str(url))
 
     # headers = {'content-type': 'application/soap+xml'}
     headers = {"content-type": "text/xml"}
@@ -833,20 +759,23 @@ def nsi_util_post_soap(url: HttpUrl, soapreqmsg: bytes) -> bytes:
             data=body,
             headers=headers,
             verify=settings.verify,
-            cert=(str(settings.NSI_AURA_CERTIFICATE), str(settings.NSI_AURA_PRIVATE_KEY)),
+            cert=settings.cert,
         )
     except requests.exceptions.ConnectionError as e:
-        log.warning("cannot get XML document", url=str(url), error=str(e))
+        log.warning("cannot get XML document", error=str(e))
         raise e
-    log.debug(response.status_code)
+    log.debug(
+        "received SOAP reply",
+        status_code=response.status_code,
+        content_type=response.headers.get("content-type"),
+    )
     if response.status_code != 200:
         response.raise_for_status()
-    log.debug(f"#CONTENT TYPE# {response.headers['content-type']}")
     if content_type_is_valid_soap(response.headers["content-type"]):
         return response.content
     # log.debug(response.encoding)
     # log.debug(response.content)
-    raise Exception(str(url) + " did not return XML, but" + response.headers["content-type"])
+    raise Exception(f"{url} did not return XML, but {response.headers['content-type']}")
 
 
 def nsi_soap_parse_reserve_reply(soap_xml: bytes) -> dict[str, Any]:
@@ -854,15 +783,13 @@ def nsi_soap_parse_reserve_reply(soap_xml: bytes) -> dict[str, Any]:
 
     Returns: ConnectionId as string.
     """
-    log = logger.bind()
-
     # Parse XML
-    tree = etree.fromstring(soap_xml)
+    tree = etree.fromstring(soap_xml, xml_parser)
 
     #
     # Get correlationId
     #
-    tag = tree.find(FIND_ANYWHERE_PREFIX + S_CORRELATION_ID_TAG)
+    tag = find_anywhere(tree, S_CORRELATION_ID_TAG)
     correlation_id_str = tag.text  # type: ignore[union-attr]
 
     #
@@ -870,16 +797,16 @@ def nsi_soap_parse_reserve_reply(soap_xml: bytes) -> dict[str, Any]:
     #
     # TODO: check for error / faultstring
     #
-    tag = tree.find(FIND_ANYWHERE_PREFIX + S_CONNECTION_ID_TAG)
+    tag = find_anywhere(tree, S_CONNECTION_ID_TAG)
     connection_id_str = tag.text  # type: ignore[union-attr]
 
-    tag = tree.find(FIND_ANYWHERE_PREFIX + S_FAULTSTRING_TAG)
+    tag = find_anywhere(tree, S_FAULTSTRING_TAG)
     if tag is None:
         faultstring = None
     else:
         faultstring = tag.text
 
-    log.debug("nsi_soap_parse_reserve_reply: Got error?", faultstring=faultstring)
+    logger.debug("nsi_soap_parse_reserve_reply: Got error?", faultstring=faultstring)
 
     return {
         S_FAULTSTRING_TAG: faultstring,
@@ -918,24 +845,22 @@ def nsi_soap_parse_correlationid_reply(soap_xml: bytes) -> dict[str, Any]:
     Returns: dict with S_FAULTSTRING_TAG and S_CORRELATION_ID_TAG as keys, values string
     if S_FAULTSTRING_TAG is not None, there was a faulstring tag.
     """
-    log = logger.bind()
-
     # Parse XML
-    tree = etree.fromstring(soap_xml)
+    tree = etree.fromstring(soap_xml, xml_parser)
 
     #
     # Get correlationId
     #
-    tag = tree.find(FIND_ANYWHERE_PREFIX + S_CORRELATION_ID_TAG)
+    tag = find_anywhere(tree, S_CORRELATION_ID_TAG)
     correlation_id_str = tag.text  # type: ignore[union-attr]
 
-    tag = tree.find(FIND_ANYWHERE_PREFIX + S_FAULTSTRING_TAG)
+    tag = find_anywhere(tree, S_FAULTSTRING_TAG)
     if tag is None:
         faultstring = None
     else:
         faultstring = tag.text
 
-    log.debug("nsi_soap_parse_correlationid_reply: Got error?", faultstring=faultstring)
+    logger.debug("nsi_soap_parse_correlationid_reply: Got error?", faultstring=faultstring)
 
     return {
         S_FAULTSTRING_TAG: faultstring,
@@ -958,7 +883,7 @@ def nsi_send_reserve(reservation: Reservation, source_stp: STP, dest_stp: STP) -
     reserve_xml = generate_reserve_xml(
         reserve_template,
         reservation.correlationId,
-        str(settings.NSA_BASE_URL) + "api/nsi/callback/",
+        settings.NSI_CALLBACK_URL,
         reservation.description,
         reservation.globalReservationId,
         reservation.startTime.replace(tzinfo=timezone.utc) if reservation.startTime else datetime.now(timezone.utc),
@@ -988,7 +913,7 @@ def nsi_send_reserve_commit(reservation: Reservation) -> dict[str, str]:
     soap_xml = generate_reserve_commit_xml(
         reserve_commit_template,
         reservation.correlationId,
-        str(settings.NSA_BASE_URL) + "api/nsi/callback/",
+        settings.NSI_CALLBACK_URL,
         str(reservation.connectionId),
         settings.NSI_PROVIDER_ID,
     )
@@ -1008,7 +933,7 @@ def nsi_send_provision(reservation: Reservation) -> dict[str, str]:
     soap_xml = generate_provision_xml(
         provision_template,
         reservation.correlationId,
-        str(settings.NSA_BASE_URL) + "api/nsi/callback/",
+        settings.NSI_CALLBACK_URL,
         str(reservation.connectionId),
         settings.NSI_PROVIDER_ID,
     )
@@ -1022,7 +947,7 @@ def nsi_send_reserve_abort(reservation: Reservation) -> dict[str, Any]:
     soap_xml = generate_reserve_abort_xml(
         reserve_abort_template,
         reservation.correlationId,
-        str(settings.NSA_BASE_URL) + "api/nsi/callback/",
+        settings.NSI_CALLBACK_URL,
         str(reservation.connectionId),
         settings.NSI_PROVIDER_ID,
     )
@@ -1034,7 +959,7 @@ def nsi_send_release(reservation: Reservation) -> dict[str, Any]:
     soap_xml = generate_release_xml(
         release_template,
         reservation.correlationId,
-        str(settings.NSA_BASE_URL) + "api/nsi/callback/",
+        settings.NSI_CALLBACK_URL,
         str(reservation.connectionId),
         settings.NSI_PROVIDER_ID,
     )
@@ -1046,7 +971,7 @@ def nsi_send_terminate(reservation: Reservation) -> dict[str, Any]:
     soap_xml = generate_terminate_xml(
         terminate_template,
         reservation.correlationId,
-        str(settings.NSA_BASE_URL) + "api/nsi/callback/",
+        settings.NSI_CALLBACK_URL,
         str(reservation.connectionId),
         settings.NSI_PROVIDER_ID,
     )
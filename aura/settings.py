@@ -70,6 +70,11 @@ class Settings(BaseSettings):
         """External base URL of this NSA."""
         return HttpUrl(f"{self.NSA_SCHEME}://{self.NSA_HOST}:{self.NSA_PORT}{self.NSA_PATH_PREFIX}")
 
+    @property
+    def NSI_CALLBACK_URL(self) -> str:
+        """External URL of the NSI callback endpoint of this NSA."""
+        return f"{self.NSA_BASE_URL}api/nsi/callback/"
+
     # Verify property for Requests:
     # False -> no verification
     # File path -> read CA certificates from file
@@ -80,5 +85,10 @@ class Settings(BaseSettings):
         """Verify option for Requests calls."""
         return (str(self.CA_CERTIFICATES) if self.CA_CERTIFICATES else None) if self.VERIFY_REQUESTS else False
 
+    @property
+    def cert(self) -> tuple[str, str]:
+        """Client certificate option for Requests calls."""
+        return str(self.NSI_AURA_CERTIFICATE), str(self.NSI_AURA_PRIVATE_KEY)
+
 
 settings = Settings(_env_file="aura.env")
@@ -15,16 +15,15 @@
 
 from __future__ import annotations
 
-import operator
 from collections import abc
-from functools import reduce, total_ordering
+from functools import total_ordering
 from typing import AbstractSet, Any, Iterable, Iterator, List, Optional, Sequence, Tuple, Union, cast
 
-from sqlalchemy import Select, select
+from sqlalchemy import bindparam, select, union_all
 
 from aura.db import Session
 from aura.fsm import ConnectionStateMachine
-from aura.functional import expand_ranges, to_ranges
+from aura.functional import merge_ranges
 from aura.model import STP, Reservation
 
 
@@ -55,6 +54,8 @@ class VlanRanges(abc.Set):
         This class support most :class:`set` operations.
     """
 
+    __slots__ = ("_vlan_ranges",)
+
     _vlan_ranges: Tuple[range, ...]
 
     def __init__(self, val: Optional[Union[str, int, Iterable[int], Sequence[Sequence[int]]]] = None) -> None:
@@ -78,19 +79,20 @@ class VlanRanges(abc.Set):
         # namely: 5, 10, 11, 12.
         # The latter three VLANs are encode as a range.
         #
-        # This intermediate format happens to be the format as accepted by :func:`supa.util.functional.expand_ranges`.
+        # This intermediate format happens to be the format as accepted by :func:`aura.functional.merge_ranges`.
         # This function has the advantage of deduplicating overlapping ranges
-        # or VLANs specified more than once.
-        # In addition its return value can be used as input to the :func:`supa.util.functional.to_ranges` function.
+        # or VLANs specified more than once,
+        # without expanding the ranges into individual VLANs first.
         vlans: Sequence[Sequence[int]] = []
         if val is None:
             self._vlan_ranges = ()
             return
         if isinstance(val, str):
             if val.strip() != "":
-                # This might look complex, but it does handle strings such as `"  3, 4, 6-9, 4, 8 - 10"`
+                # This might look complex, but it does handle strings such as `"  3, 4, 6-9, 4, 8 - 10"`,
+                # no need to strip the parts as `int` already ignores surrounding whitespace
                 try:
-                    vlans = [list(map(int, s.strip().split("-"))) for s in val.split(",")]
+                    vlans = [list(map(int, s.split("-"))) for s in val.split(",")]
                 except ValueError:
                     raise ValueError(f"{val} could not be converted to a {self.__class__.__name__} object.") from None
         elif isinstance(val, int):
@@ -106,11 +108,11 @@ class VlanRanges(abc.Set):
         else:
             raise ValueError(f"{val} could not be converted to a {self.__class__.__name__} object.")
 
-        er = expand_ranges(vlans, inclusive=True)
-        if er and not (er[0] >= 0 and er[-1] <= 4096):
+        mr = merge_ranges(vlans, inclusive=True)
+        if mr and not (mr[0].start >= 0 and mr[-1].stop - 1 <= 4096):
             raise ValueError(f"{val} is out of range (0-4096).")
 
-        self._vlan_ranges = tuple(to_ranges(er))
+        self._vlan_ranges = tuple(mr)
 
     def to_list_of_tuples(self) -> List[Tuple[int, int]]:
         """Construct list of tuples representing the VLAN ranges.
@@ -150,8 +152,8 @@ class VlanRanges(abc.Set):
             Number of VLAN's
 
         """
-        # Utilize the __iter__ method
-        return sum(1 for _ in self)
+        # Sum the lengths of the ranges instead of iterating over every VLAN
+        return sum(len(vr) for vr in self._vlan_ranges)
 
     def __str__(self) -> str:
         """Create an as compact as possible string representation of VLAN ranges.
@@ -251,7 +253,14 @@ class VlanRanges(abc.Set):
             VlanRanges([(1, 4), (10, 30)])
 
         """
-        return reduce(operator.__or__, others, self)
+        # merge the ranges of all operands in one sweep instead of creating an intermediate object per operand
+        return VlanRanges(
+            [
+                (vr.start, vr.stop - 1)
+                for o in (self, *others)
+                for vr in (o if isinstance(o, VlanRanges) else VlanRanges(o))._vlan_ranges
+            ]
+        )
 
 
 def all_vlan_ranges(stpId: int) -> VlanRanges:
@@ -260,22 +269,24 @@ def all_vlan_ranges(stpId: int) -> VlanRanges:
         return VlanRanges(session.query(STP.vlanRange).filter(STP.id == stpId).scalar())  # type: ignore[call-overload]
 
 
-def _select_in_use_vlan_ranges(select_statement: Select) -> list[int]:
-    """Already in use VLAN ranges on STP identified by stpId."""
-    with Session() as session:
-        return (
-            session.execute(select_statement.filter(Reservation.state.in_(ConnectionStateMachine.active_state_values)))  # type: ignore
-            .scalars()
-            .all()
-        )
+# build the in use VLAN statement only once, the STP is passed in as parameter on execution,
+# the VLANs in use as source and as destination on the STP are retrieved with a single round trip
+_select_in_use_vlans = union_all(
+    select(Reservation.sourceVlan).filter(  # type: ignore[call-overload]
+        Reservation.sourceStpId == bindparam("stpId"),
+        Reservation.state.in_(ConnectionStateMachine.active_state_values),  # type: ignore[attr-defined]
+    ),
+    select(Reservation.destVlan).filter(  # type: ignore[call-overload]
+        Reservation.destStpId == bindparam("stpId"),
+        Reservation.state.in_(ConnectionStateMachine.active_state_values),  # type: ignore[attr-defined]
+    ),
+)
 
 
 def in_use_vlan_ranges(stpId: int) -> VlanRanges:
-    """Free VLAN ranges on STP identified by stpId."""
-    return VlanRanges(
-        _select_in_use_vlan_ranges(select(Reservation.sourceVlan).filter(Reservation.sourceStpId == stpId))  # type: ignore
-        + _select_in_use_vlan_ranges(select(Reservation.destVlan).filter(Reservation.destStpId == stpId))  # type: ignore
-    )
+    """Already in use VLAN ranges on STP identified by stpId."""
+    with Session() as session:
+        return VlanRanges(session.execute(_select_in_use_vlans, {"stpId": stpId}).scalars().all())
 
 
 def free_vlan_ranges(stpId: int) -> VlanRanges:
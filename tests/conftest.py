@@ -25,23 +25,25 @@ for _pem in ("aura-certificate.pem", "aura-private-key.pem"):
     Path(_pem).touch(exist_ok=True)
 
 from datetime import datetime, timezone
+from unittest.mock import MagicMock, patch
 from uuid import uuid4
 
 import pytest
 from sqlalchemy.orm import sessionmaker
 from sqlmodel import Session as SQLModelSession, SQLModel, create_engine
 
-from aura.log import DatabaseLogHandler
+from aura.log import DatabaseLogHandler, QueueDatabaseLogHandler
 from aura.model import SDP, STP, Reservation
 
 
 def _disable_database_log_handler():
     """Remove DatabaseLogHandler from all loggers to prevent DB calls during tests."""
+    database_handlers = (DatabaseLogHandler, QueueDatabaseLogHandler)
     root_logger = logging.getLogger()
-    root_logger.handlers = [h for h in root_logger.handlers if not isinstance(h, DatabaseLogHandler)]
+    root_logger.handlers = [h for h in root_logger.handlers if not isinstance(h, database_handlers)]
     for logger_name in list(logging.Logger.manager.loggerDict):
         logger = logging.getLogger(logger_name)
-        logger.handlers = [h for h in logger.handlers if not isinstance(h, DatabaseLogHandler)]
+        logger.handlers = [h for h in logger.handlers if not isinstance(h, database_handlers)]
 
 
 _disable_database_log_handler()
@@ -67,6 +69,19 @@ def db_session(engine):
     connection.close()
 
 
+@pytest.fixture()
+def patch_session():
+    """Patch Session at the given target so that ``with Session.begin() as session`` yields the given session."""
+
+    def _patch_session(target, session):
+        mock_session_cls = MagicMock()
+        mock_session_cls.begin.return_value.__enter__.return_value = session
+        mock_session_cls.begin.return_value.__exit__.return_value = False
+        return patch(target, mock_session_cls)
+
+    return _patch_session
+
+
 @pytest.fixture()
 def stp_factory():
     """Factory for creating STP instances."""
@@ -0,0 +1,37 @@
+# Copyright 2024-2026 SURF.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Tests for response compression."""
+
+from fastapi.testclient import TestClient
+
+
+class TestCompression:
+    def test_page_is_compressed(self, test_app):
+        client = TestClient(test_app)
+        response = client.get("/api/", headers={"accept-encoding": "gzip"})
+        assert response.status_code == 200
+        assert response.headers["content-encoding"] == "gzip"
+
+    def test_page_not_compressed_when_not_accepted(self, test_app):
+        client = TestClient(test_app)
+        response = client.get("/api/", headers={"accept-encoding": "identity"})
+        assert response.status_code == 200
+        assert "content-encoding" not in response.headers
+
+    def test_small_response_not_compressed(self, test_app):
+        client = TestClient(test_app)
+        response = client.get("/healthcheck", headers={"accept-encoding": "gzip"})
+        assert response.status_code == 200
+        assert "content-encoding" not in response.headers
@@ -0,0 +1,151 @@
+# Copyright 2024-2026 SURF.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Tests for the /api/nsi/callback/ endpoint."""
+
+from unittest.mock import patch
+from uuid import uuid4
+
+import pytest
+from fastapi.testclient import TestClient
+
+RESERVE_COMMIT_CONFIRMED = """<soap:Envelope xmlns:soap="http://schemas.xmlsoap.org/soap/envelope/">
+    <soap:Header>
+        <nsiHeader xmlns="http://schemas.ogf.org/nsi/2013/12/framework/headers">
+            <correlationId>urn:uuid:{correlationId}</correlationId>
+        </nsiHeader>
+    </soap:Header>
+    <soap:Body>
+        <reserveCommitConfirmed xmlns="http://schemas.ogf.org/nsi/2013/12/connection/types">
+            <connectionId>{connectionId}</connectionId>
+        </reserveCommitConfirmed>
+    </soap:Body>
+</soap:Envelope>"""
+
+
+RESERVE_COMMIT_CONFIRMED_ACTION = '"http://schemas.ogf.org/nsi/2013/12/connection/service/reserveCommitConfirmed"'
+
+DATA_PLANE_STATE_CHANGE = """<soap:Envelope xmlns:soap="http://schemas.xmlsoap.org/soap/envelope/">
+    <soap:Header>
+        <nsiHeader xmlns="http://schemas.ogf.org/nsi/2013/12/framework/headers">
+            <correlationId>urn:uuid:{correlationId}</correlationId>
+        </nsiHeader>
+    </soap:Header>
+    <soap:Body>
+        <dataPlaneStateChange xmlns="http://schemas.ogf.org/nsi/2013/12/connection/types">
+            <connectionId>{connectionId}</connectionId>
+            <notificationId>1</notificationId>
+            <timeStamp>2025-01-01T00:00:00+00:00</timeStamp>
+            <dataPlaneStatus>
+                <active>true</active>
+                <version>1</version>
+                <versionConsistent>true</versionConsistent>
+            </dataPlaneStatus>
+        </dataPlaneStateChange>
+    </soap:Body>
+</soap:Envelope>"""
+
+
+DATA_PLANE_STATE_CHANGE_ACTION = '"http://schemas.ogf.org/nsi/2013/12/connection/service/dataPlaneStateChange"'
+
+
+class TestNsiCallback:
+    def test_acknowledges_after_processing(self, test_app):
+        correlation_id = uuid4()
+        with patch("aura.frontend.nsi.nsi_process_callback") as mock_process:
+            response = TestClient(test_app).post(
+                "/api/nsi/callback/",
+                content=RESERVE_COMMIT_CONFIRMED.format(correlationId=correlation_id, connectionId=uuid4()),
+                headers={"content-type": "text/xml", "soapaction": RESERVE_COMMIT_CONFIRMED_ACTION},
+            )
+
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/xml"
+        assert str(correlation_id) in response.text
+        mock_process.assert_called_once()
+        action, body = mock_process.call_args.args
+        assert action == RESERVE_COMMIT_CONFIRMED_ACTION
+        assert body["Header"]["nsiHeader"]["correlationId"] == correlation_id
+
+    def test_rejects_too_large_body(self, test_app):
+        with (
+            patch("aura.frontend.nsi.MAX_CALLBACK_SIZE", 100),
+            patch("aura.frontend.nsi.nsi_process_callback") as mock_process,
+        ):
+            response = TestClient(test_app).post(
+                "/api/nsi/callback/",
+                content=RESERVE_COMMIT_CONFIRMED.format(correlationId=uuid4(), connectionId=uuid4()),
+                headers={"content-type": "text/xml", "soapaction": RESERVE_COMMIT_CONFIRMED_ACTION},
+            )
+
+        assert response.status_code == 413
+        mock_process.assert_not_called()
+
+    @pytest.mark.parametrize(
+        "content,content_type,status_code",
+        [
+            pytest.param("{}", "application/json", 415, id="not-soap"),
+            pytest.param("", "text/xml", 400, id="empty"),
+        ],
+    )
+    def test_rejects_without_parsing(self, test_app, content, content_type, status_code):
+        with (
+            patch("aura.frontend.nsi.nsi_xml_to_dict") as mock_parse,
+            patch("aura.frontend.nsi.nsi_process_callback") as mock_process,
+        ):
+            response = TestClient(test_app).post(
+                "/api/nsi/callback/",
+                content=content,
+                headers={"content-type": content_type, "soapaction": RESERVE_COMMIT_CONFIRMED_ACTION},
+            )
+
+        assert response.status_code == status_code
+        mock_parse.assert_not_called()
+        mock_process.assert_not_called()
+
+
+class TestNsiProcessCallback:
+    def test_updates_reservation_state(self, db_session, reservation_factory, patch_session):
+        from aura.frontend.nsi import nsi_process_callback
+        from aura.nsi import nsi_xml_to_dict
+
+        reservation = reservation_factory(state="CONNECTION_RESERVE_COMMITTING")
+        db_session.add(reservation)
+        db_session.flush()
+        body = nsi_xml_to_dict(
+            RESERVE_COMMIT_CONFIRMED.format(
+                correlationId=reservation.correlationId, connectionId=reservation.connectionId
+            ).encode()
+        )
+
+        with patch_session("aura.db.Session", db_session):
+            nsi_process_callback(RESERVE_COMMIT_CONFIRMED_ACTION, body)
+
+        assert reservation.state == "CONNECTION_RESERVE_COMMITTED"
+
+    def test_notification_matched_on_connection_id(self, db_session, reservation_factory, patch_session):
+        from aura.frontend.nsi import nsi_process_callback
+        from aura.nsi import nsi_xml_to_dict
+
+        reservation = reservation_factory(state="CONNECTION_PROVISIONED")
+        db_session.add(reservation)
+        db_session.flush()
+        body = nsi_xml_to_dict(
+            DATA_PLANE_STATE_CHANGE.format(correlationId=uuid4(), connectionId=reservation.connectionId).encode()
+        )
+
+        with patch_session("aura.db.Session", db_session):
+            nsi_process_callback(DATA_PLANE_STATE_CHANGE_ACTION, body)
+
+        assert reservation.state == "CONNECTION_ACTIVE"
@@ -0,0 +1,84 @@
+# Copyright 2024-2026 SURF.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Tests for aura.frontend.reservations: sending NSI requests from the reservation pages."""
+
+from unittest.mock import patch
+
+import pytest
+from fastapi import HTTPException
+
+from aura.frontend.reservations import (
+    reservation_provision,
+    reservation_release,
+    reservation_terminate,
+)
+from aura.job import nsi_send_provision_job, nsi_send_release_job, nsi_send_terminate_job
+
+
+class TestSendNsiRequest:
+    @pytest.mark.parametrize(
+        "endpoint,state,new_state,job",
+        [
+            pytest.param(
+                reservation_terminate,
+                "CONNECTION_RESERVE_COMMITTED",
+                "CONNECTION_TERMINATING",
+                nsi_send_terminate_job,
+                id="terminate",
+            ),
+            pytest.param(
+                reservation_release, "CONNECTION_ACTIVE", "CONNECTION_RELEASING", nsi_send_release_job, id="release"
+            ),
+            pytest.param(
+                reservation_provision,
+                "CONNECTION_RESERVE_COMMITTED",
+                "CONNECTION_PROVISIONING",
+                nsi_send_provision_job,
+                id="provision",
+            ),
+        ],
+    )
+    def test_transition_and_schedule_job(
+        self, endpoint, state, new_state, job, db_session, reservation_factory, patch_session
+    ):
+        reservation = reservation_factory(state=state)
+        db_session.add(reservation)
+        db_session.flush()
+
+        with (
+            patch_session("aura.frontend.reservations.Session", db_session),
+            patch("aura.frontend.reservations.scheduler") as mock_scheduler,
+        ):
+            events = endpoint(reservation.id)
+
+        assert reservation.state == new_state
+        mock_scheduler.add_job.assert_called_once_with(job, args=[reservation.id])
+        assert events[1].event.url == f"/reservations/{reservation.id}/log"
+
+    def test_transition_not_allowed(self, db_session, reservation_factory, patch_session):
+        reservation = reservation_factory(state="CONNECTION_NEW")
+        db_session.add(reservation)
+        db_session.flush()
+
+        with (
+            patch_session("aura.frontend.reservations.Session", db_session),
+            patch("aura.frontend.reservations.scheduler") as mock_scheduler,
+        ):
+            with pytest.raises(HTTPException) as exc_info:
+                reservation_release(reservation.id)
+
+        assert exc_info.value.status_code == 500
+        assert reservation.state == "CONNECTION_NEW"
+        mock_scheduler.add_job.assert_not_called()
@@ -21,7 +21,7 @@ from unittest.mock import patch
 import pytest
 from sqlalchemy import or_, update
 
-from aura.dds import has_alias, strip_urn, to_dict, to_list, topology_to_stps, unzip, update_sdps
+from aura.dds import has_alias, strip_urn, to_dict, to_list, topology_to_stps, unzip, update_sdps, update_stps
 from aura.model import SDP, STP
 from tests.data.topology_samples import MINIMAL_TOPOLOGY, MOXY_TOPOLOGY
 
@@ -33,6 +33,11 @@ class TestStripUrn:
             pytest.param("urn:ogf:network:surf.example:2024:net:port", "surf.example:2024:net:port", id="with-prefix"),
             pytest.param("surf.example:2024:net:port", "surf.example:2024:net:port", id="without-prefix"),
             pytest.param("urn:ogf:network:", "", id="only-prefix"),
+            pytest.param(
+                "surf.example:2024:net:urn:ogf:network:port",
+                "surf.example:2024:net:urn:ogf:network:port",
+                id="prefix-not-at-start",
+            ),
         ],
     )
     def test_strip_urn(self, urn, expected):
@@ -149,6 +154,47 @@ class TestTopologyToStps:
         assert stps[0].vlanRange == "100-200"
 
 
+class TestUpdateStps:
+    def test_add_update_and_deactivate(self, db_session, stp_factory, patch_session):
+        """New STPs are added, changed STPs updated and vanished STPs marked inactive in one pass."""
+        db_session.add(stp_factory(stpId="surf.example:2024:net:unchanged"))
+        db_session.add(stp_factory(stpId="surf.example:2024:net:changed"))
+        db_session.add(stp_factory(stpId="surf.example:2024:net:vanished"))
+        db_session.flush()
+
+        with patch_session("aura.dds.Session", db_session):
+            update_stps(
+                [
+                    stp_factory(stpId="surf.example:2024:net:unchanged"),
+                    stp_factory(stpId="surf.example:2024:net:changed", vlanRange="300-400"),
+                    stp_factory(stpId="surf.example:2024:net:new"),
+                ]
+            )
+            db_session.flush()
+
+        stps = {stp.stpId: stp for stp in db_session.query(STP).all()}
+        assert len(stps) == 4
+        assert stps["surf.example:2024:net:unchanged"].active
+        assert stps["surf.example:2024:net:changed"].vlanRange == "300-400"
+        assert stps["surf.example:2024:net:new"].active
+        assert not stps["surf.example:2024:net:vanished"].active
+
+    def test_duplicated_stpid_is_added_once(self, db_session, stp_factory, patch_session):
+        """An STP listed twice is added once and updated with the values of the last listing."""
+        with patch_session("aura.dds.Session", db_session):
+            update_stps(
+                [
+                    stp_factory(stpId="surf.example:2024:net:duplicated"),
+                    stp_factory(stpId="surf.example:2024:net:duplicated", vlanRange="300-400"),
+                ]
+            )
+            db_session.flush()
+
+        stps = db_session.query(STP).all()
+        assert len(stps) == 1
+        assert stps[0].vlanRange == "300-400"
+
+
 class TestUpdateSdps:
     @staticmethod
     def _make_sdp_pair(db_session):
@@ -363,6 +409,44 @@ class TestUpdateSdps:
         finally:
             mock.stop()
 
+    def test_stale_duplicate_sdps_do_not_abort_update(self, db_session, stp_factory):
+        """Duplicate SDPs between STPs that are not looked up do not stop the other SDPs from being updated."""
+        stale_a = stp_factory(stpId="north.example:2024:net:stale-a")
+        stale_z = stp_factory(stpId="south.example:2024:net:stale-z")
+        db_session.add(stale_a)
+        db_session.add(stale_z)
+        db_session.flush()
+        for _ in range(2):
+            db_session.add(
+                SDP(stpAId=stale_a.id, stpZId=stale_z.id, vlanRange="100-200", description="Stale", active=False)
+            )
+        stp_a, stp_z = self._make_sdp_pair(db_session)
+
+        mock = self._patch_session(db_session)
+        try:
+            update_sdps()
+        finally:
+            mock.stop()
+
+        sdp = db_session.query(SDP).filter(SDP.stpAId == stp_a.id, SDP.stpZId == stp_z.id).one()
+        assert sdp.active
+
+    def test_update_sdps_marks_vanished_sdp_inactive(self, db_session):
+        """An SDP whose STPs no longer form a pair is marked inactive."""
+        stp_a, _ = self._make_sdp_pair(db_session)
+
+        mock = self._patch_session(db_session)
+        try:
+            update_sdps()
+            assert db_session.query(SDP).one().active
+            stp_a.active = False
+            db_session.flush()
+            update_sdps()
+            db_session.flush()
+            assert not db_session.query(SDP).one().active
+        finally:
+            mock.stop()
+
     def test_update_sdps_finds_sdp_regardless_of_stp_order(self, db_session):
         """An SDP(A, Z) must be found even when the STP pair is discovered in
         reverse order (Z, A) on a subsequent run. The or_ query covers both
@@ -12,7 +12,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-"""Tests for aura.frontend.util: to_aura_connection_state and reservation_buttons."""
+"""Tests for aura.frontend.util: app_page, active_tabs, to_aura_connection_state and reservation_buttons."""
 
 import pytest
 
@@ -279,3 +279,118 @@ class TestReservationButtons:
 
         for absent in absent_buttons:
             assert absent not in button_texts, f"Unexpected button '{absent}' found in state {state}"
+
+
+class TestAppPage:
+    def test_navbar_and_footer_are_shared(self):
+        from aura.frontend.util import app_page
+
+        first = app_page(title="first")
+        second = app_page(title="second")
+        assert first[1] is second[1]
+        assert first[-1] is second[-1]
+        assert first[0].text != second[0].text
+
+    def test_logo_follows_root_path(self, monkeypatch):
+        from aura.frontend.util import aura_logo
+        from aura.settings import settings
+
+        monkeypatch.setattr(settings, "ROOT_PATH", "/aura")
+        assert aura_logo().components[0].src == "/aura/static/ANA-website-footer.png"
+        monkeypatch.setattr(settings, "ROOT_PATH", "")
+        assert aura_logo().components[0].src == "/static/ANA-website-footer.png"
+
+
+class TestActiveTabs:
+    def test_links_below_url(self):
+        from aura.frontend.util import active_tabs
+
+        (link_list,) = active_tabs("/stp")
+        assert [link.on_click.url for link in link_list.links] == ["/stp/active", "/stp/inactive", "/stp/all"]
+        assert [link.active for link in link_list.links] == [
+            "startswith:/stp/active",
+            "startswith:/stp/inactive",
+            "startswith:/stp/all",
+        ]
+
+
+class TestNotModified:
+    @staticmethod
+    def _request(if_none_match=None):
+        from starlette.requests import Request
+
+        headers = [(b"if-none-match", if_none_match.encode())] if if_none_match else []
+        return Request({"type": "http", "method": "GET", "path": "/", "headers": headers})
+
+    def test_etag_set_on_first_request(self, stp_factory):
+        from fastapi import Response
+
+        from aura.frontend.util import not_modified
+
+        response = Response()
+        assert not_modified(self._request(), response, stp_factory()) is None
+        assert response.headers["etag"].startswith('"')
+        assert response.headers["cache-control"] == "private, no-cache"
+
+    def test_not_modified_when_etag_matches(self, stp_factory):
+        from fastapi import Response
+
+        from aura.frontend.util import not_modified
+
+        stp = stp_factory()
+        response = Response()
+        not_modified(self._request(), response, stp)
+        etag = response.headers["etag"]
+
+        not_modified_response = not_modified(self._request(etag), Response(), stp)
+        assert not_modified_response is not None
+        assert not_modified_response.status_code == 304
+        assert not_modified_response.headers["etag"] == etag
+
+    def test_etag_changes_with_content(self, stp_factory):
+        from fastapi import Response
+
+        from aura.frontend.util import not_modified
+
+        stp = stp_factory()
+        response = Response()
+        not_modified(self._request(), response, stp)
+        etag = response.headers["etag"]
+
+        stp.description = "Changed STP"
+        changed_response = Response()
+        assert not_modified(self._request(etag), changed_response, stp) is None
+        assert changed_response.headers["etag"] != etag
+
+    def test_etag_changes_with_release(self, stp_factory):
+        from unittest.mock import patch
+
+        from fastapi import Response
+
+        from aura.frontend.util import not_modified
+
+        stp = stp_factory()
+        response = Response()
+        not_modified(self._request(), response, stp)
+        etag = response.headers["etag"]
+
+        other_release_response = Response()
+        with patch("aura.frontend.util._release", "0.0.0"):
+            assert not_modified(self._request(etag), other_release_response, stp) is None
+        assert other_release_response.headers["etag"] != etag
+
+    def test_etag_changes_with_root_path(self, stp_factory, monkeypatch):
+        from fastapi import Response
+
+        from aura.frontend.util import not_modified
+        from aura.settings import settings
+
+        stp = stp_factory()
+        response = Response()
+        not_modified(self._request(), response, stp)
+        etag = response.headers["etag"]
+
+        monkeypatch.setattr(settings, "ROOT_PATH", "/aura")
+        other_root_path_response = Response()
+        assert not_modified(self._request(etag), other_root_path_response, stp) is None
+        assert other_root_path_response.headers["etag"] != etag
@@ -12,11 +12,11 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-"""Tests for aura.functional: expand_ranges() and to_ranges()."""
+"""Tests for aura.functional: expand_ranges(), to_ranges() and merge_ranges()."""
 
 import pytest
 
-from aura.functional import expand_ranges, to_ranges
+from aura.functional import expand_ranges, merge_ranges, to_ranges
 
 
 class TestExpandRanges:
@@ -83,3 +83,41 @@ class TestToRanges:
     def test_generator_input(self):
         result = list(to_ranges(x for x in [1, 2, 3, 5]))
         assert result == [range(1, 4), range(5, 6)]
+
+
+class TestMergeRanges:
+    @pytest.mark.parametrize(
+        "ranges,inclusive,expected",
+        [
+            pytest.param([], True, [], id="empty-list"),
+            pytest.param([[1]], False, [range(1, 2)], id="single-value"),
+            pytest.param([[1], [2], [3]], False, [range(1, 4)], id="adjacent-single-values"),
+            pytest.param([[1, 5]], False, [range(1, 5)], id="range-exclusive"),
+            pytest.param([[1, 5]], True, [range(1, 6)], id="range-inclusive"),
+            pytest.param([[100], [1, 4]], True, [range(1, 5), range(100, 101)], id="unsorted-input"),
+            pytest.param([[1, 5], [3, 7]], True, [range(1, 8)], id="overlapping-ranges"),
+            pytest.param([[1, 10], [3, 7]], True, [range(1, 11)], id="contained-range"),
+            pytest.param([[1, 5], [6, 7]], True, [range(1, 8)], id="adjacent-ranges-inclusive"),
+            pytest.param([[1, 5], [6, 7]], False, [range(1, 5), range(6, 7)], id="gap-ranges-exclusive"),
+            pytest.param([[1], [1]], False, [range(1, 2)], id="duplicate-values"),
+            pytest.param([[5, 3]], True, [], id="reversed-range"),
+            pytest.param([[1, 1]], False, [], id="single-element-range-exclusive"),
+        ],
+    )
+    def test_merge_ranges(self, ranges, inclusive, expected):
+        assert merge_ranges(ranges, inclusive=inclusive) == expected
+
+    @pytest.mark.parametrize(
+        "ranges",
+        [
+            pytest.param([[4], [10, 12], [11, 14]], id="docstring-example"),
+            pytest.param([[0, 4095]], id="full-vlan-space"),
+            pytest.param([[7], [1, 3], [5, 5], [2, 9], [20], [19]], id="mixed"),
+        ],
+    )
+    def test_same_as_expand_then_to_ranges(self, ranges):
+        assert merge_ranges(ranges, inclusive=True) == list(to_ranges(expand_ranges(ranges, inclusive=True)))
+
+    def test_merge_ranges_invalid_length(self):
+        with pytest.raises(ValueError, match="Got 3 element list"):
+            merge_ranges([[1, 2, 3]])
@@ -39,6 +39,7 @@ class TestNewCorrelationIdOnReservation:
 
 
 class TestNsiPollDdsJob:
+    @patch("aura.job._previous_topology_documents", {})
     @patch("aura.job.update_sdps")
     @patch("aura.job.update_stps")
     @patch("aura.job.topology_to_stps")
@@ -59,6 +60,59 @@ class TestNsiPollDdsJob:
         mock_update_stps.assert_called_once()
         mock_update_sdps.assert_called_once()
 
+    @patch("aura.job._previous_topology_documents", {})
+    @patch("aura.job.update_sdps")
+    @patch("aura.job.update_stps")
+    @patch("aura.job.topology_to_stps")
+    @patch("aura.job.nsi_xml_to_dict")
+    @patch("aura.job.get_dds_documents")
+    def test_skips_update_when_topology_did_not_change(
+        self, mock_get_dds, mock_xml_to_dict, mock_topo_to_stps, mock_update_stps, mock_update_sdps
+    ):
+        from aura.job import TOPOLOGY_MIME_TYPE, invalidate_previous_topology_documents, nsi_poll_dds_job
+
+        mock_xml_to_dict.return_value = {"id": "test"}
+        mock_topo_to_stps.return_value = []
+
+        mock_get_dds.return_value = {TOPOLOGY_MIME_TYPE: {"topo1": b"<xml/>"}}
+        nsi_poll_dds_job()
+        mock_get_dds.return_value = {TOPOLOGY_MIME_TYPE: {"topo1": b"<xml/>"}}
+        nsi_poll_dds_job()
+        assert mock_update_stps.call_count == 1
+        assert mock_update_sdps.call_count == 1
+
+        mock_get_dds.return_value = {TOPOLOGY_MIME_TYPE: {"topo1": b"<xml version='2'/>"}}
+        nsi_poll_dds_job()
+        assert mock_update_stps.call_count == 2
+        assert mock_update_sdps.call_count == 2
+
+        invalidate_previous_topology_documents()
+        nsi_poll_dds_job()
+        assert mock_update_stps.call_count == 3
+        assert mock_update_sdps.call_count == 3
+
+    @patch("aura.job._previous_topology_documents", {})
+    @patch("aura.job.update_sdps")
+    @patch("aura.job.update_stps")
+    @patch("aura.job.topology_to_stps")
+    @patch("aura.job.nsi_xml_to_dict")
+    @patch("aura.job.get_dds_documents")
+    def test_retries_update_after_failure(
+        self, mock_get_dds, mock_xml_to_dict, mock_topo_to_stps, mock_update_stps, mock_update_sdps
+    ):
+        from aura.job import TOPOLOGY_MIME_TYPE, nsi_poll_dds_job
+
+        mock_get_dds.return_value = {TOPOLOGY_MIME_TYPE: {"topo1": b"<xml/>"}}
+        mock_xml_to_dict.return_value = {"id": "test"}
+        mock_topo_to_stps.return_value = []
+        mock_update_stps.side_effect = [RuntimeError("database is locked"), None]
+
+        with pytest.raises(RuntimeError):
+            nsi_poll_dds_job()
+        nsi_poll_dds_job()
+        assert mock_update_stps.call_count == 2
+        mock_update_sdps.assert_called_once()
+
 
 class TestNsiSendReserveJob:
     @patch("aura.job.nsi_send_reserve")
@@ -12,132 +12,191 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-"""Tests for aura.log: DatabaseLogHandler and UvicornAccessLogFilter."""
+"""Tests for aura.log: DatabaseLogHandler, QueueDatabaseLogHandler and UvicornAccessLogFilter."""
 
+import asyncio
 from logging import LogRecord
+from threading import Thread
 from unittest.mock import MagicMock, patch
 
 import pytest
 
-from aura.log import DatabaseLogHandler, UvicornAccessLogFilter
+from aura.log import DatabaseLogHandler, LogMessageNotifier, QueueDatabaseLogHandler, UvicornAccessLogFilter
 
 
 class TestDatabaseLogHandler:
-    @patch("aura.log.Session")
-    def test_emit_with_reservationId(self, mock_session_cls):
+    def test_emit_with_reservationId(self, patch_session):
         handler = DatabaseLogHandler()
         record = LogRecord("test", 20, "test.py", 1, None, (), None)
         record.msg = {"event": "test event", "reservationId": 42}
 
         mock_session = MagicMock()
-        mock_session_cls.begin.return_value.__enter__ = MagicMock(return_value=mock_session)
-        mock_session_cls.begin.return_value.__exit__ = MagicMock(return_value=False)
 
-        handler.emit(record)
+        with patch_session("aura.log.Session", mock_session):
+            handler.emit(record)
         mock_session.add.assert_called_once()
 
+    @patch("aura.log.log_message_notifier")
+    def test_emit_notifies_log_streams(self, mock_notifier, patch_session):
+        handler = DatabaseLogHandler()
+        record = LogRecord("test", 20, "test.py", 1, None, (), None)
+        record.msg = {"event": "test event", "reservationId": 42}
+
+        mock_session = MagicMock()
+
+        with patch_session("aura.log.Session", mock_session):
+            handler.emit(record)
+        mock_notifier.notify.assert_called_once_with(42)
+
+    @patch("aura.log.log_message_notifier")
     @patch("aura.log.Session")
-    def test_emit_without_structlog_dict_skips(self, mock_session_cls):
+    def test_emit_without_structlog_dict_does_not_notify(self, mock_session_cls, mock_notifier):
+        handler = DatabaseLogHandler()
+        record = LogRecord("test", 20, "test.py", 1, "plain string message", (), None)
+
+        handler.emit(record)
+        mock_notifier.notify.assert_not_called()
+
+    def test_emit_without_structlog_dict_skips(self, patch_session):
         handler = DatabaseLogHandler()
         record = LogRecord("test", 20, "test.py", 1, "plain string message", (), None)
 
         mock_session = MagicMock()
-        mock_session_cls.begin.return_value.__enter__ = MagicMock(return_value=mock_session)
-        mock_session_cls.begin.return_value.__exit__ = MagicMock(return_value=False)
 
-        handler.emit(record)
+        with patch_session("aura.log.Session", mock_session):
+            handler.emit(record)
         mock_session.add.assert_not_called()
 
-    @patch("aura.log.Session")
-    def test_emit_with_no_matching_id_sets_negative(self, mock_session_cls):
+    def test_emit_with_no_matching_id_sets_negative(self, patch_session):
         handler = DatabaseLogHandler()
         record = LogRecord("test", 20, "test.py", 1, None, (), None)
         record.msg = {"event": "some event"}
 
         mock_session = MagicMock()
-        mock_session_cls.begin.return_value.__enter__ = MagicMock(return_value=mock_session)
-        mock_session_cls.begin.return_value.__exit__ = MagicMock(return_value=False)
 
-        handler.emit(record)
+        with patch_session("aura.log.Session", mock_session):
+            handler.emit(record)
         # reservationId is -1, so add should not be called (reservationId < 0)
         mock_session.add.assert_not_called()
 
-    @patch("aura.log.Session")
-    def test_emit_with_connectionId_queries_db(self, mock_session_cls):
+    def test_emit_with_connectionId_queries_db(self, patch_session):
         handler = DatabaseLogHandler()
         record = LogRecord("test", 20, "test.py", 1, None, (), None)
         record.msg = {"event": "test", "connectionId": "4f0a4f6b-1187-4670-b451-bb8005105ba5"}
 
         mock_session = MagicMock()
         mock_session.query.return_value.filter.return_value.scalar.return_value = 5
-        mock_session_cls.begin.return_value.__enter__ = MagicMock(return_value=mock_session)
-        mock_session_cls.begin.return_value.__exit__ = MagicMock(return_value=False)
 
-        handler.emit(record)
+        with patch_session("aura.log.Session", mock_session):
+            handler.emit(record)
         mock_session.query.assert_called_once()
         mock_session.add.assert_called_once()
 
-    @patch("aura.log.Session")
-    def test_emit_with_globalReservationId_queries_db(self, mock_session_cls):
+    def test_emit_with_globalReservationId_queries_db(self, patch_session):
         handler = DatabaseLogHandler()
         record = LogRecord("test", 20, "test.py", 1, None, (), None)
         record.msg = {"event": "test", "globalReservationId": "4f0a4f6b-1187-4670-b451-bb8005105ba5"}
 
         mock_session = MagicMock()
         mock_session.query.return_value.filter.return_value.scalar.return_value = 7
-        mock_session_cls.begin.return_value.__enter__ = MagicMock(return_value=mock_session)
-        mock_session_cls.begin.return_value.__exit__ = MagicMock(return_value=False)
 
-        handler.emit(record)
+        with patch_session("aura.log.Session", mock_session):
+            handler.emit(record)
         mock_session.query.assert_called_once()
         mock_session.add.assert_called_once()
 
-    @patch("aura.log.Session")
-    def test_emit_with_correlationId_queries_db(self, mock_session_cls):
+    def test_emit_with_correlationId_queries_db(self, patch_session):
         handler = DatabaseLogHandler()
         record = LogRecord("test", 20, "test.py", 1, None, (), None)
         record.msg = {"event": "test", "correlationId": "4f0a4f6b-1187-4670-b451-bb8005105ba5"}
 
         mock_session = MagicMock()
         mock_session.query.return_value.filter.return_value.scalar.return_value = 9
-        mock_session_cls.begin.return_value.__enter__ = MagicMock(return_value=mock_session)
-        mock_session_cls.begin.return_value.__exit__ = MagicMock(return_value=False)
 
-        handler.emit(record)
+        with patch_session("aura.log.Session", mock_session):
+            handler.emit(record)
         mock_session.query.assert_called_once()
         mock_session.add.assert_called_once()
 
-    @patch("aura.log.Session")
-    def test_emit_with_connectionId_none_string_skips_lookup(self, mock_session_cls):
+    def test_emit_with_connectionId_none_string_skips_lookup(self, patch_session):
         handler = DatabaseLogHandler()
         record = LogRecord("test", 20, "test.py", 1, None, (), None)
         record.msg = {"event": "test", "connectionId": "None"}
 
         mock_session = MagicMock()
-        mock_session_cls.begin.return_value.__enter__ = MagicMock(return_value=mock_session)
-        mock_session_cls.begin.return_value.__exit__ = MagicMock(return_value=False)
 
-        handler.emit(record)
+        with patch_session("aura.log.Session", mock_session):
+            handler.emit(record)
         # connectionId == "None" is explicitly skipped, falls through to reservationId = -1
         mock_session.add.assert_not_called()
 
-    @patch("aura.log.Session")
-    def test_emit_with_connectionId_not_found_raises(self, mock_session_cls):
+    def test_emit_with_connectionId_not_found_raises(self, patch_session):
         handler = DatabaseLogHandler()
         record = LogRecord("test", 20, "test.py", 1, None, (), None)
         record.msg = {"event": "test", "connectionId": "4f0a4f6b-1187-4670-b451-bb8005105ba5"}
 
         mock_session = MagicMock()
         mock_session.query.return_value.filter.return_value.scalar.return_value = None
-        mock_session_cls.begin.return_value.__enter__ = MagicMock(return_value=mock_session)
-        mock_session_cls.begin.return_value.__exit__ = MagicMock(return_value=False)
 
         # scalar() returns None when not found; code does `if reservationId >= 0`
         # which raises TypeError comparing None >= 0 (a latent bug)
-        with pytest.raises(TypeError, match="not supported between instances of 'NoneType' and 'int'"):
+        with (
+            patch_session("aura.log.Session", mock_session),
+            pytest.raises(TypeError, match="not supported between instances of 'NoneType' and 'int'"),
+        ):
             handler.emit(record)
 
 
+class TestQueueDatabaseLogHandler:
+    @patch("aura.log.DatabaseLogHandler")
+    def test_record_stored_from_listener_thread(self, mock_handler_cls):
+        handler = QueueDatabaseLogHandler()
+        record = LogRecord("test", 20, "test.py", 1, None, (), None)
+        record.msg = {"event": "test event", "reservationId": 42}
+
+        handler.emit(record)
+        handler.listener.stop()  # waits until all queued records are handled
+
+        mock_handler_cls.return_value.handle.assert_called_once()
+        (stored_record,) = mock_handler_cls.return_value.handle.call_args.args
+        assert stored_record.msg == {"event": "test event", "reservationId": 42}
+
+
+class TestLogMessageNotifier:
+    @pytest.mark.asyncio
+    async def test_notify_resolves_waiter(self):
+        notifier = LogMessageNotifier()
+        waiter = notifier.waiter(42)
+        other = notifier.waiter(43)
+        notifier.notify(42)
+        await asyncio.wait_for(waiter, timeout=1)
+        assert not other.done()
+        other.cancel()
+
+    @pytest.mark.asyncio
+    async def test_notify_from_other_thread(self):
+        notifier = LogMessageNotifier()
+        waiter = notifier.waiter(42)
+        thread = Thread(target=notifier.notify, args=(42,))
+        thread.start()
+        await asyncio.wait_for(waiter, timeout=1)
+        thread.join()
+
+    @pytest.mark.asyncio
+    async def test_done_waiters_are_discarded(self):
+        notifier = LogMessageNotifier()
+        resolved = notifier.waiter(42)
+        cancelled = notifier.waiter(42)
+        notifier.notify(42)
+        await resolved
+        cancelled.cancel()
+        await asyncio.sleep(0)  # let the done callbacks run
+        assert notifier._waiters == {}
+
+    def test_notify_without_waiters(self):
+        LogMessageNotifier().notify(42)
+
+
 class TestUvicornAccessLogFilter:
     @pytest.mark.parametrize(
         "args,expected",
@@ -19,6 +19,7 @@ from unittest.mock import MagicMock, patch
 import pytest
 import requests.exceptions
 from requests.structures import CaseInsensitiveDict
+from structlog.testing import capture_logs
 
 
 class TestNsiUtilGetXml:
@@ -36,14 +37,25 @@ class TestNsiUtilGetXml:
         result = nsi_util_get_xml("http://example.com/doc")
         assert result == b"<xml/>"
 
+    @pytest.mark.parametrize(
+        "exception",
+        [
+            pytest.param(requests.exceptions.ConnectionError("fail"), id="connection-error"),
+            pytest.param(requests.exceptions.ReadTimeout("fail"), id="read-timeout"),
+            pytest.param(requests.exceptions.TooManyRedirects("fail"), id="too-many-redirects"),
+        ],
+    )
     @patch("aura.nsi.session")
-    def test_connection_error_returns_none(self, mock_session):
+    def test_request_exception_returns_none(self, mock_session, exception):
         from aura.nsi import nsi_util_get_xml
 
-        mock_session.get.side_effect = requests.exceptions.ConnectionError("fail")
+        mock_session.get.side_effect = exception
 
-        result = nsi_util_get_xml("http://example.com/doc")
+        with capture_logs() as logs:
+            result = nsi_util_get_xml("http://example.com/doc")
         assert result is None
+        assert logs[-1]["log_level"] == "warning"
+        assert logs[-1]["url"] == "http://example.com/doc"
 
     @patch("aura.nsi.session")
     def test_non_200_returns_none(self, mock_session):
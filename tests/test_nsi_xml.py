@@ -20,8 +20,11 @@ from uuid import UUID, uuid4
 import pytest
 
 from aura.nsi import (
+    SoapTemplate,
+    SoapTemplateFile,
     acknowledgement_template,
     content_type_is_valid_soap,
+    find_anywhere,
     generate_acknowledgement_xml,
     generate_provision_xml,
     generate_query_recursive_xml,
@@ -58,6 +61,9 @@ class TestContentTypeIsValidSoap:
             pytest.param("text/xml;charset=utf-8", True, id="text-xml-charset"),
             pytest.param("text/xml; charset=UTF-8", True, id="text-xml-charset-space"),
             pytest.param("TEXT/XML", True, id="text-xml-upper"),
+            pytest.param("application/xml; charset=UTF-8", True, id="application-xml-charset"),
+            pytest.param(" text/xml ", True, id="surrounding-whitespace"),
+            pytest.param("text/xmlfoo", False, id="text-xml-prefix"),
             pytest.param("application/json", False, id="json"),
             pytest.param("text/html", False, id="html"),
             pytest.param("application/soap+xml", False, id="soap-xml"),
@@ -67,6 +73,39 @@ class TestContentTypeIsValidSoap:
         assert content_type_is_valid_soap(content_type) == expected
 
 
+class TestSoapTemplate:
+    def test_substitute(self):
+        template = SoapTemplate("<a>#CORRELATION-ID#</a><b>#PROVIDER-NSA-ID#</b>")
+        assert (
+            template.substitute({"CORRELATION-ID": "urn:uuid:1", "PROVIDER-NSA-ID": "nsa"})
+            == "<a>urn:uuid:1</a><b>nsa</b>"
+        )
+
+    def test_lone_hash_left_as_is(self):
+        template = SoapTemplate('<a type="http://schemas.ogf.org/nml/2013/05/base#isAlias">#CONNECTION-ID#</a>')
+        assert (
+            template.substitute({"CONNECTION-ID": "conn-id"})
+            == '<a type="http://schemas.ogf.org/nml/2013/05/base#isAlias">conn-id</a>'
+        )
+
+    def test_missing_value_raises(self):
+        with pytest.raises(KeyError):
+            SoapTemplate("<a>#CONNECTION-ID#</a>").substitute({})
+
+
+class TestSoapTemplateFile:
+    def test_read_on_first_use(self, tmp_path):
+        (path := tmp_path / "template.xml").write_text("<a>#CONNECTION-ID#</a>")
+        template_file = SoapTemplateFile(path)
+        assert "template" not in vars(template_file)
+        assert template_file.substitute({"CONNECTION-ID": "conn-id"}) == "<a>conn-id</a>"
+        assert isinstance(vars(template_file)["template"], SoapTemplate)
+
+    def test_missing_file_raises(self, tmp_path):
+        with pytest.raises(FileNotFoundError):
+            SoapTemplateFile(tmp_path / "missing.xml")
+
+
 class TestGenerateReserveXml:
     def test_all_placeholders_replaced(self):
         correlation_id = uuid4()
@@ -234,6 +273,15 @@ class TestNsiXmlToDict:
         result = nsi_xml_to_dict(xml)
         assert result["element"] == "text"
 
+    def test_entities_not_expanded(self):
+        xml = b"""<?xml version="1.0"?>
+        <!DOCTYPE root [<!ENTITY entity "expanded">]>
+        <root>
+            <element>text&entity;</element>
+        </root>"""
+        result = nsi_xml_to_dict(xml)
+        assert result["element"] == "text"
+
 
 class TestNsiUtilElementToDict:
     def test_with_attributes(self):
@@ -272,6 +320,27 @@ class TestNsiUtilElementToDict:
         assert isinstance(result["startTime"], datetime)
 
 
+class TestFindAnywhere:
+    @pytest.mark.parametrize(
+        "tag,expected",
+        [
+            pytest.param("first", "one", id="child"),
+            pytest.param("second", "two", id="first-in-document-order"),
+            pytest.param("root", None, id="root-not-included"),
+            pytest.param("missing", None, id="not-found"),
+        ],
+    )
+    def test_same_as_find(self, tag, expected):
+        from lxml import etree
+
+        tree = etree.fromstring(
+            b"<root><first>one</first><nested><second>two</second></nested><second>x</second></root>"
+        )
+        element = find_anywhere(tree, tag)
+        assert (element.text if element is not None else None) == expected
+        assert element is tree.find(".//" + tag)
+
+
 class TestNsiSoapParseReserveReply:
     def test_successful_reply(self):
         xml = b"""<soap:Envelope xmlns:soap="http://schemas.xmlsoap.org/soap/envelope/">
@@ -134,6 +134,14 @@ class TestRootPathPrebuiltHtml:
         # api_path_strip should not appear in the default case
         assert "api_path_strip" not in html
 
+    def test_landing_html_rendered_once_per_root_path(self):
+        """The landing page HTML is rendered once and reused for every client side route."""
+        from aura import landing_html
+
+        assert landing_html("title", "") is landing_html("title", "")
+        assert landing_html("title", "/aura") is not landing_html("title", "")
+        assert "/aura/api" in landing_html("title", "/aura")
+
 
 def find_values(obj, key):
     """Recursively find all values for a given key in a nested dict/list structure."""
@@ -0,0 +1,43 @@
+# Copyright 2024-2026 SURF.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Tests for aura.settings: derived URL and Requests properties."""
+
+import pytest
+
+from aura.settings import Settings
+
+
+class TestNsiCallbackUrl:
+    @pytest.mark.parametrize(
+        "path_prefix,expected",
+        [
+            pytest.param("", "https://aura.example/api/nsi/callback/", id="no-prefix"),
+            pytest.param("/aura/", "https://aura.example/aura/api/nsi/callback/", id="prefix-trailing-slash"),
+        ],
+    )
+    def test_callback_url(self, path_prefix, expected):
+        settings = Settings(
+            _env_file=None, NSA_SCHEME="https", NSA_HOST="aura.example", NSA_PORT="443", NSA_PATH_PREFIX=path_prefix
+        )
+        assert settings.NSI_CALLBACK_URL == expected
+
+
+class TestCert:
+    def test_cert_is_tuple_of_str(self, tmp_path):
+        certificate = tmp_path / "certificate.pem"
+        private_key = tmp_path / "private-key.pem"
+        certificate.touch()
+        private_key.touch()
+        settings = Settings(_env_file=None, NSI_AURA_CERTIFICATE=certificate, NSI_AURA_PRIVATE_KEY=private_key)
+        assert settings.cert == (str(certificate), str(private_key))
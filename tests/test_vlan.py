@@ -128,6 +128,8 @@ class TestVlanRangesDunderMethods:
         "val,expected_len",
         [
             pytest.param("1-10", 10, id="range"),
+            pytest.param("1-3,5,10-19", 14, id="multiple-ranges"),
+            pytest.param("0-4096", 4097, id="full-range"),
             pytest.param("", 0, id="empty-string"),
             pytest.param(None, 0, id="none"),
         ],
@@ -164,12 +166,24 @@ class TestVlanRangesDunderMethods:
         result = VlanRanges("10-20").union(VlanRanges("20-30"), {1, 2, 3, 4})
         assert result == VlanRanges("1-4,10-30")
 
+    def test_union_no_others(self):
+        assert VlanRanges("10-20").union() == VlanRanges("10-20")
+
+    def test_union_empty(self):
+        assert VlanRanges().union(VlanRanges(), set()) == VlanRanges()
+
     def test_to_list_of_tuples(self):
         assert VlanRanges("10-12,8").to_list_of_tuples() == [(8, 8), (10, 12)]
 
     def test_to_list_of_tuples_empty(self):
         assert VlanRanges(None).to_list_of_tuples() == []
 
+    def test_slots(self):
+        vr = VlanRanges("1-10")
+        assert not hasattr(vr, "__dict__")
+        with pytest.raises(AttributeError):
+            vr.foo = "bar"
+
 
 class TestVlanRangesDbFunctions:
     @patch("aura.vlan.Session")
@@ -207,3 +221,27 @@ class TestVlanRangesDbFunctions:
 
         result = free_vlan_ranges(1)
         assert result == VlanRanges("100-104,106-110")
+
+    def test_in_use_vlan_ranges_only_active_reservations(self, db_session, reservation_factory):
+        from aura.vlan import in_use_vlan_ranges
+
+        db_session.add(
+            reservation_factory(sourceStpId=1, destStpId=2, sourceVlan=100, destVlan=200, state="CONNECTION_ACTIVE")
+        )
+        db_session.add(
+            reservation_factory(sourceStpId=2, destStpId=1, sourceVlan=300, destVlan=101, state="RESERVE_HELD")
+        )
+        db_session.add(
+            reservation_factory(sourceStpId=1, destStpId=2, sourceVlan=102, destVlan=202, state="CONNECTION_NEW")
+        )
+        db_session.add(
+            reservation_factory(sourceStpId=3, destStpId=4, sourceVlan=103, destVlan=203, state="CONNECTION_ACTIVE")
+        )
+        db_session.flush()
+
+        with patch("aura.vlan.Session") as mock_session_cls:
+            mock_session_cls.return_value.__enter__ = lambda _: db_session
+            mock_session_cls.return_value.__exit__ = lambda *_: None
+            assert in_use_vlan_ranges(1) == VlanRanges([100, 101])
+            assert in_use_vlan_ranges(2) == VlanRanges([200, 300])
+            assert in_use_vlan_ranges(5) == VlanRanges()